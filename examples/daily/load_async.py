@@ -0,0 +1,29 @@
+"""
+Example: Asynchronous daily data access
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+from datetime import datetime
+from meteostat import Daily
+
+# Set time period
+start = datetime(2000, 1, 1)
+end = datetime(2018, 12, 31)
+
+
+async def main():
+    """
+    Load data for multiple weather stations without blocking the event loop
+    """
+
+    data = await Daily.load_async(["10637", "10635", "10729"], start, end)
+    print(data.fetch())
+
+
+asyncio.run(main())
@@ -0,0 +1,23 @@
+"""
+Example: Warm the cache ahead of time
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+from datetime import datetime
+from meteostat import Stations, prefetch
+
+# Get weather stations in Hesse, Germany
+stations = Stations().region("DE", "HE")
+
+# Download daily and monthly data into the cache
+# Same as:
+# python -m meteostat prefetch --country DE --region HE \
+#     --granularity daily monthly --start 2010-01-01
+report = prefetch(stations, ["daily", "monthly"], start=datetime(2010, 1, 1))
+
+print(f"{report['downloaded']} of {report['files']} files downloaded")
@@ -22,6 +22,7 @@ from .interface.hourly import Hourly
 from .interface.daily import Daily
 from .interface.monthly import Monthly
 from .interface.normals import Normals
+from .interface.prefetch import prefetch
 
 __all__ = [
     "Base",
@@ -32,4 +33,5 @@ __all__ = [
     "Daily",
     "Monthly",
     "Normals",
+    "prefetch",
 ]
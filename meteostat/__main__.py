@@ -0,0 +1,111 @@
+"""
+Command Line Interface
+
+Usage: python -m meteostat prefetch --stations 10637 10635 --start 2020-01-01
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from typing import List, Optional
+from meteostat.interface.base import Base
+from meteostat.interface.stations import Stations
+from meteostat.interface.prefetch import SERIES, prefetch
+
+
+def get_parser() -> ArgumentParser:
+    """
+    Create the argument parser
+    """
+
+    parser = ArgumentParser(prog="python -m meteostat")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser(
+        "prefetch", help="Download data of weather stations into the cache"
+    )
+    selection = command.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--stations", nargs="+", help="Weather station IDs")
+    selection.add_argument("--country", help="ISO 3166-1 alpha-2 country code")
+    command.add_argument("--region", help="Region code (requires --country)")
+    command.add_argument(
+        "--granularity",
+        nargs="+",
+        choices=[granularity.value for granularity in SERIES],
+        default=[granularity.value for granularity in SERIES],
+        help="Granularities to prefetch",
+    )
+    command.add_argument("--start", type=datetime.fromisoformat, help="Start date")
+    command.add_argument("--end", type=datetime.fromisoformat, help="End date")
+    command.add_argument("--no-model", action="store_true", help="Exclude model data")
+    command.add_argument(
+        "--threads", type=int, default=32, help="Number of concurrent downloads"
+    )
+    command.add_argument("--cache-dir", help="Location of the cache directory")
+    command.add_argument("--endpoint", help="Base URL or path of the time series data")
+    command.add_argument("--quiet", action="store_true", help="Hide progress")
+
+    return parser
+
+
+def print_progress(done: int, total: int) -> None:
+    """
+    Print the number of completed files
+    """
+
+    sys.stderr.write(f"\r{done}/{total} files")
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line interface
+    """
+
+    args = get_parser().parse_args(argv)
+
+    # Configure all interfaces
+    if args.cache_dir:
+        Base.cache_dir = args.cache_dir
+    if args.endpoint:
+        for series in SERIES.values():
+            series.endpoint = args.endpoint
+
+    # Select weather stations
+    if args.stations:
+        stations = args.stations
+    else:
+        stations = Stations().region(args.country, args.region).fetch()
+
+    report = prefetch(
+        stations,
+        args.granularity,
+        args.start,
+        args.end,
+        not args.no_model,
+        args.threads,
+        None if args.quiet else print_progress,
+    )
+
+    print(
+        f"{report['files']} files, {report['bytes']} bytes: "
+        + ", ".join(
+            f"{count} {key}"
+            for key, count in report.items()
+            if key not in ("files", "bytes")
+        )
+    )
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,8 +9,34 @@ The code is licensed under the MIT license.
 """
 
 import os
+import json
 import time
 import hashlib
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+import pandas as pd
+from meteostat.core.manifest import (
+    manifest_access,
+    manifest_add,
+    manifest_evict,
+    manifest_expired,
+    manifest_flush,
+    manifest_remove,
+    manifest_scan,
+    manifest_touch,
+)
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pragma: no cover
+    pa = None
+
+# Magic bytes of Feather (Arrow IPC) files
+FEATHER_MAGIC = b"ARROW1"
 
 
 def get_local_file_path(cache_dir: str, cache_subdir: str, path: str) -> str:
@@ -46,26 +72,348 @@ def file_in_cache(path: str, max_age: int = 0) -> bool:
     return False
 
 
+def file_missing(path: str, max_age: int = 0) -> bool:
+    """
+    Check if a file is known to be missing on the server
+    """
+
+    meta = f"{path}.meta"
+
+    if (
+        os.path.isfile(path)
+        or not os.path.isfile(meta)
+        or time.time() - os.path.getmtime(meta) > max_age
+    ):
+        return False
+
+    try:
+        with open(meta, "r", encoding="utf-8") as file:
+            return json.load(file).get("missing", False)
+    except (OSError, ValueError):
+        return False
+
+
+def read_cache(
+    path: str, columns: Optional[List[str]] = None, memory_map: bool = False
+) -> pd.DataFrame:
+    """
+    Read a DataFrame from the local cache
+
+    If a list of columns is passed, other columns are skipped (the index is
+    always included). Both Feather and pickle files are supported.
+
+    Feather files can be memory-mapped. Their pages are then shared with
+    other processes through the page cache and only the pages of the
+    requested columns are read.
+    """
+
+    with open(path, "rb") as file:
+        magic = file.read(len(FEATHER_MAGIC))
+
+    # Track access for LRU eviction
+    manifest_access(path)
+
+    # Pickle files
+    if magic != FEATHER_MAGIC:
+        df = pd.read_pickle(path)
+        return df if columns is None else df[df.columns.intersection(columns)]
+
+    if pa is None:
+        raise ImportError(f"Reading {path} requires pyarrow")
+
+    # Only read the requested columns and the index
+    if columns is not None:
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+        index = [
+            col
+            for col in schema.pandas_metadata["index_columns"]
+            if isinstance(col, str)
+        ]
+        columns = index + [col for col in columns if col in schema.names]
+
+    return feather.read_table(path, columns=columns, memory_map=memory_map).to_pandas()
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Get a temporary path which replaces the given path once written, so
+    readers never see a partially written file
+    """
+
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(fd)
+
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.isfile(tmp):
+            os.remove(tmp)
+        raise
+
+
+def lock_path(path: str) -> str:
+    """
+    Get the path of the lock file of a cache entry
+    """
+
+    return f"{path}.lock"
+
+
+def write_cache(
+    path: str,
+    df: pd.DataFrame,
+    meta: Optional[dict] = None,
+    fmt: str = "feather",
+    ttl: int = 0,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> None:
+    """
+    Write a DataFrame and its metadata to the local cache
+
+    Feather files are written if pyarrow is installed and the DataFrame
+    can be converted. Otherwise, the DataFrame is pickled. Feather files can
+    be compressed with "lz4" or "zstd". The codec is stored in the file, so
+    it's picked up automatically when reading. The entry is added to the
+    cache manifest with the given TTL.
+    """
+
+    table = None
+
+    if fmt == "feather" and pa is not None:
+        try:
+            # Arrow-backed columns might consist of many small chunks
+            table = pa.Table.from_pandas(df).combine_chunks()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+
+    with atomic_path(path) as tmp:
+        if table is not None:
+            feather.write_feather(
+                table,
+                tmp,
+                compression=compression or "uncompressed",
+                compression_level=compression_level,
+            )
+        else:
+            df.to_pickle(tmp)
+
+    if meta:
+        write_cache_meta(path, meta)
+
+    manifest_add(
+        path, ttl, bool(meta and (meta.get("etag") or meta.get("last_modified")))
+    )
+
+
+def read_cache_meta(path: str) -> dict:
+    """
+    Read the metadata (e.g. HTTP validators) of a cached file
+    """
+
+    # Metadata is only useful if the cached file exists
+    if not os.path.isfile(path):
+        return {}
+
+    try:
+        with open(f"{path}.meta", "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache_meta(path: str, meta: dict) -> None:
+    """
+    Write the metadata of a cached file
+    """
+
+    with atomic_path(f"{path}.meta") as tmp:
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump({key: value for key, value in meta.items() if value}, file)
+
+
+def write_cache_missing(path: str, ttl: int = 0) -> None:
+    """
+    Remember that a file is missing on the server
+    """
+
+    # Remove outdated data
+    if os.path.isfile(path):
+        os.remove(path)
+
+    write_cache_meta(path, {"missing": True})
+
+    manifest_add(path, ttl)
+
+
+def touch_cache(path: str) -> None:
+    """
+    Mark a cached file and its metadata as fresh
+    """
+
+    for file in (path, f"{path}.meta"):
+        if os.path.isfile(file):
+            os.utime(file)
+
+    manifest_touch(path)
+
+
+def promote_cache(shared_path: str, path: str, ttl: int = 0) -> bool:
+    """
+    Copy a cache entry from a shared (read-only) cache to the local cache
+    if it's newer than the local entry
+    """
+
+    sources = [
+        file for file in (shared_path, f"{shared_path}.meta") if os.path.isfile(file)
+    ]
+
+    if not sources:
+        return False
+
+    mtime = max(os.path.getmtime(file) for file in sources)
+    local_mtime = max(
+        (
+            os.path.getmtime(file)
+            for file in (path, f"{path}.meta")
+            if os.path.isfile(file)
+        ),
+        default=None,
+    )
+
+    if local_mtime is not None and mtime <= local_mtime:
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Copy files including their modification time
+    for file in sources:
+        with atomic_path(path + file[len(shared_path) :]) as tmp:
+            shutil.copy2(file, tmp)
+
+    # Shared entry is a missing file
+    if shared_path not in sources and os.path.isfile(path):
+        os.remove(path)
+
+    manifest_add(path, ttl, len(sources) > 1, mtime)
+
+    return True
+
+
+def remove_cache(path: str) -> None:
+    """
+    Remove a cache entry and its metadata
+
+    Lock files are kept, as other processes might hold or wait for them.
+    """
+
+    for file in (path, f"{path}.meta"):
+        try:
+            os.remove(file)
+        except FileNotFoundError:
+            pass
+
+
+def scan_cache(cls, max_age: int = None) -> None:
+    """
+    Clear the cache by scanning the cache directory
+    """
+
+    # Expired files which can be revalidated are kept a bit longer
+    grace = cls.revalidation_period if max_age is None else 0
+
+    # Set max_age
+    if max_age is None:
+        max_age = cls.max_age
+
+    # Get current time
+    now = time.time()
+
+    # Get all files
+    files = set(os.listdir(cls.cache_dir + os.sep + cls.cache_subdir))
+
+    # Go through all files
+    for file in files:
+        # Metadata is removed along with its file, locks are kept
+        if (file.endswith(".meta") and file[:-5] in files) or file.endswith(".lock"):
+            continue
+
+        # Get full path
+        path = os.path.join(cls.cache_dir + os.sep + cls.cache_subdir, file)
+
+        # Get maximum age of the file
+        if file.endswith(".meta"):
+            limit = max(max_age, cls.missing_max_age) if grace else max_age
+        elif f"{file}.meta" in files:
+            limit = max_age + grace
+        else:
+            limit = max_age
+
+        # Check if file is older than max_age
+        if now - os.path.getmtime(path) > limit and os.path.isfile(path):
+            # Delete file and its metadata
+            remove_cache(path[:-5] if file.endswith(".meta") else path)
+
+
+def _remove_entries(cache_dir: str, entries: List[tuple]) -> None:
+    """
+    Delete cache entries (subdirectory and file name) and remove them from
+    the manifest
+    """
+
+    for subdir, file in entries:
+        remove_cache(os.path.join(cache_dir, subdir, file))
+
+    manifest_remove(cache_dir, entries)
+
+
 @classmethod
-def clear_cache(cls, max_age: int = None) -> None:
+def clear_cache(cls, max_age: int = None, limit: Optional[int] = None) -> None:
     """
     Clear the cache
+
+    Expired entries are looked up in the cache manifest. At most `limit`
+    entries are removed at once, so the cleanup can be spread across calls.
+    Afterwards, least recently used entries are removed until the cache fits
+    its size limits.
     """
 
     if os.path.exists(cls.cache_dir + os.sep + cls.cache_subdir):
-        # Set max_age
-        if max_age is None:
-            max_age = cls.max_age
-
-        # Get current time
-        now = time.time()
-
-        # Go through all files
-        for file in os.listdir(cls.cache_dir + os.sep + cls.cache_subdir):
-            # Get full path
-            path = os.path.join(cls.cache_dir + os.sep + cls.cache_subdir, file)
-
-            # Check if file is older than max_age
-            if now - os.path.getmtime(path) > max_age and os.path.isfile(path):
-                # Delete file
-                os.remove(path)
+        try:
+            # Index existing files once
+            manifest_scan(
+                cls.cache_dir, cls.cache_subdir, cls.max_age, cls.missing_max_age
+            )
+
+            # Get expired entries
+            files = manifest_expired(
+                cls.cache_dir,
+                cls.cache_subdir,
+                max_age,
+                cls.revalidation_period,
+                limit,
+            )
+
+            _remove_entries(cls.cache_dir, [(cls.cache_subdir, file) for file in files])
+
+            # Remove least recently used entries which exceed the size limits
+            if cls.max_cache_size is not None or cls.max_total_cache_size is not None:
+                manifest_flush(cls.cache_dir)
+                _remove_entries(
+                    cls.cache_dir,
+                    manifest_evict(
+                        cls.cache_dir,
+                        cls.cache_subdir,
+                        cls.max_cache_size,
+                        cls.max_total_cache_size,
+                    ),
+                )
+
+        # Fall back to scanning the cache directory
+        except sqlite3.Error:
+            scan_cache(cls, max_age)
@@ -0,0 +1,114 @@
+"""
+Core Class - Interval Index
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def get_nanoseconds(values) -> np.ndarray:
+    """
+    Convert dates to nanoseconds since the epoch
+    """
+
+    return pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(values))).as_unit("ns").asi8
+
+
+class IntervalIndex:
+    """
+    An index of time intervals which are sorted by start and end
+
+    Queries find the intervals which cover a period, looking at the shorter
+    of the intervals starting before the period and the intervals ending
+    after it. This takes O(n) time in the worst case. Counts use a merge
+    sort tree of the ends in the order of the starts and take O(log² n) time
+    per period. Positions refer to the intervals the index was built from,
+    intervals without start or end are never returned.
+    """
+
+    def __init__(self, start, end) -> None:
+        start, end = get_nanoseconds(start), get_nanoseconds(end)
+        missing = np.iinfo("int64").min
+        positions = np.flatnonzero((start != missing) & (end != missing))
+
+        self._start = start
+        self._end = end
+
+        # Intervals sorted by start
+        self._start_order = positions[np.argsort(start[positions], kind="stable")]
+        self._starts = start[self._start_order]
+
+        # Intervals sorted by end
+        self._end_order = positions[np.argsort(end[positions], kind="stable")]
+        self._ends = end[self._end_order]
+
+        # Ranks of the ends in the order of the starts
+        ranks = np.empty(len(start), dtype="int64")
+        ranks[self._end_order] = np.arange(len(positions))
+        ranks = ranks[self._start_order]
+
+        # Levels of the merge sort tree, sorted by node and rank
+        self._levels = []
+        size = 1
+        while size <= len(positions):
+            nodes = np.arange(len(positions)) // size
+            self._levels.append(np.sort(nodes * len(positions) + ranks))
+            size *= 2
+
+    def __len__(self) -> int:
+        return len(self._start_order)
+
+    def query(self, first, last) -> np.ndarray:
+        """
+        Get the positions of all intervals which start before or on the first
+        and end on or after the last date
+        """
+
+        first, last = get_nanoseconds(first)[0], get_nanoseconds(last)[0]
+
+        # Number of intervals starting before or on the first date
+        started = np.searchsorted(self._starts, first, side="right")
+
+        # Number of intervals ending before the last date
+        ended = np.searchsorted(self._ends, last, side="left")
+
+        if started <= len(self) - ended:
+            candidates = self._start_order[:started]
+            return candidates[self._end[candidates] >= last]
+
+        candidates = self._end_order[ended:]
+        return candidates[self._start[candidates] <= first]
+
+    def count(self, first, last) -> np.ndarray:
+        """
+        Count the intervals which cover each of many periods
+        """
+
+        first, last = get_nanoseconds(first), get_nanoseconds(last)
+
+        # Number of intervals starting before or on the first date
+        started = np.searchsorted(self._starts, first, side="right")
+
+        # Number of intervals ending before the last date
+        ended = np.searchsorted(self._ends, last, side="left")
+
+        # The started intervals consist of at most one node per level
+        result = np.zeros(len(last), dtype="int64")
+        for level, keys in enumerate(self._levels):
+            nodes = started >> level
+            inside = (nodes & 1) == 1
+            nodes = nodes[inside] - 1
+
+            # Intervals of the node ending on or after the last date
+            result[inside] += (nodes + 1) << level
+            result[inside] -= np.searchsorted(
+                keys, nodes * len(self) + ended[inside], side="left"
+            )
+
+        return result
@@ -8,16 +8,117 @@ under the terms of the Creative Commons Attribution-NonCommercial
 The code is licensed under the MIT license.
 """
 
-from io import BytesIO
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import RawIOBase
 from gzip import GzipFile
-from urllib.request import Request, ProxyHandler, build_opener
+from http.client import HTTPMessage
 from urllib.error import HTTPError
 from multiprocessing import Pool
 from multiprocessing.pool import ThreadPool
-from typing import Callable, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Hashable,
+    List,
+    Optional,
+)
 import pandas as pd
+from meteostat.core.sources import is_remote, open_url
+from meteostat.core.transport import AsyncSession
 from meteostat.core.warn import warn
 
+# Maximum number of files listed in a warning
+MAX_REPORTED_FILES = 5
+
+
+# Maximum number of background tasks running at once
+MAX_BACKGROUND_TASKS = 4
+
+# Executor of background tasks
+_executor: Optional[ThreadPoolExecutor] = None  # pylint: disable=invalid-name
+
+# Keys of pending background tasks
+_pending: set = set()
+
+# Lock for the background tasks
+_pending_lock = threading.Lock()
+
+
+def _reset_background() -> None:
+    """
+    Drop the inherited executor in a forked child process
+    """
+
+    global _executor, _pending, _pending_lock  # pylint: disable=global-statement
+
+    _executor = None
+    _pending = set()
+    _pending_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_background)
+
+
+def background_handler(key: Hashable, task: Callable, *args) -> bool:
+    """
+    Run a task in a background thread unless a task with the same key
+    is pending, returning whether the task was scheduled
+    """
+
+    global _executor  # pylint: disable=global-statement
+
+    with _pending_lock:
+        if key in _pending:
+            return False
+
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                MAX_BACKGROUND_TASKS, thread_name_prefix="meteostat"
+            )
+
+        _pending.add(key)
+
+    def run() -> None:
+        try:
+            task(*args)
+        finally:
+            with _pending_lock:
+                _pending.discard(key)
+
+    _executor.submit(run)
+
+    return True
+
+
+def concat_handler(output: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge loaded datasets and report files which couldn't be loaded
+    """
+
+    # Files which couldn't be loaded
+    missing = [df.attrs.pop("missing") for df in output if "missing" in df.attrs]
+
+    # Display a single warning
+    if missing:
+        files = ", ".join(missing[:MAX_REPORTED_FILES])
+        if len(missing) > MAX_REPORTED_FILES:
+            files += ", ..."
+        warn(f"Cannot load {len(missing)} of {len(output)} files ({files})")
+
+    # Remove empty DataFrames
+    filtered = list(filter(lambda df: not df.empty, output))
+
+    return pd.concat(filtered) if len(filtered) > 0 else output[0]
+
 
 def processing_handler(
     datasets: List, load: Callable[[dict], None], cores: int, threads: int
@@ -56,13 +157,170 @@ def processing_handler(
         for dataset in datasets:
             output.append(load(*dataset))
 
-    # Remove empty DataFrames
-    filtered = list(filter(lambda df: not df.empty, output))
+    return concat_handler(output)
+
+
+async def async_processing_handler(
+    datasets: List, load: Callable[..., Awaitable], concurrency: int
+) -> pd.DataFrame:
+    """
+    Load multiple datasets concurrently within an event loop
+    """
+
+    # Limit the number of downloads in flight
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(dataset: tuple) -> pd.DataFrame:
+        async with semaphore:
+            return await load(*dataset)
+
+    output = await asyncio.gather(*(run(dataset) for dataset in datasets))
+
+    return await thread_handler(concat_handler, output)
+
+
+async def thread_handler(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the default executor of the event loop
+    """
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
 
-    return pd.concat(filtered) if len(filtered) > 0 else output[0]
 
+class ChunkStream(RawIOBase):
+    """
+    A readable stream of chunks which are added by another thread
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: queue.SimpleQueue = queue.SimpleQueue()
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def put(self, chunk: Optional[bytes]) -> None:
+        """
+        Add a chunk, None marks the end of the stream
+        """
+
+        self._chunks.put(chunk)
+
+    def readinto(self, buffer) -> int:
+        while len(self._chunk) == 0:
+            chunk = self._chunks.get()
+
+            # End of the stream
+            if chunk is None:
+                self._chunks.put(None)
+                return 0
+
+            self._chunk = memoryview(chunk)
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+
+        return size
+
+
+def read_handler(
+    fileobj: BinaryIO,
+    names: Optional[List] = None,
+    dtype: Optional[dict] = None,
+    parse_dates: Optional[List] = None,
+) -> pd.DataFrame:
+    """
+    Read a gzipped CSV stream into a DataFrame
 
-def load_handler(
+    The stream is decompressed while it's parsed, so the compressed file is
+    never held in memory as a whole.
+    """
+
+    # Decompress the content while reading
+    with GzipFile(fileobj=fileobj, mode="rb") as file:
+        try:
+            return pd.read_csv(
+                file,
+                names=names,
+                dtype=dtype,
+                parse_dates=parse_dates,
+            )
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame(columns=names)
+
+
+def get_conditional_headers(meta: Optional[dict]) -> dict:
+    """
+    Get the headers of a conditional request
+    """
+
+    headers = {}
+
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    return headers
+
+
+def get_response_meta(status: int, headers: HTTPMessage) -> dict:
+    """
+    Get the status and validators of a response
+    """
+
+    return {
+        "status": status,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+
+
+def response_handler(status: int, headers: HTTPMessage, meta: Optional[dict]) -> bool:
+    """
+    Check if a file was modified, remembering the status and validators of
+    the response in the metadata (if any)
+    """
+
+    # File was not modified
+    if status == 304:
+        return False
+
+    # Remember status and validators of the response
+    if meta is not None:
+        meta.update(get_response_meta(status, headers))
+
+    return True
+
+
+def error_handler(  # pylint: disable=too-many-arguments
+    exception: Exception,
+    endpoint: str,
+    path: str,
+    names: Optional[List],
+    default_df: Optional[pd.DataFrame],
+    meta: Optional[dict],
+) -> pd.DataFrame:
+    """
+    Get the DataFrame of a file which couldn't be loaded, remembering the
+    status in the metadata (if any) or displaying a warning
+    """
+
+    # Remember status or display warning
+    if meta is not None:
+        meta["status"] = getattr(exception, "code", 404)
+    else:
+        warn(f"Cannot load {path} from {endpoint}")
+
+    return default_df if default_df is not None else pd.DataFrame(columns=names)
+
+
+def load_handler(  # pylint: disable=too-many-arguments
     endpoint: str,
     path: str,
     proxy: Optional[str] = None,
@@ -70,34 +328,118 @@ def load_handler(
     dtype: Optional[dict] = None,
     parse_dates: Optional[List] = None,
     default_df: Optional[pd.DataFrame] = None,
-) -> pd.DataFrame:
+    timeout: Optional[float] = None,
+    pool_size: int = 10,
+    meta: Optional[dict] = None,
+    memory_map: bool = False,
+) -> Optional[pd.DataFrame]:
     """
     Load a single CSV file into a DataFrame
+
+    The endpoint is either a HTTP(S) URL, a file:// URL or a local
+    directory path.
+
+    If metadata is passed, the request is conditional on its validators and
+    None is returned if the file was not modified. Otherwise, the metadata
+    is updated with the response's status and validators. Files which cannot
+    be loaded are then left to the caller to report.
     """
 
     try:
-        handlers = []
+        # Read CSV file from Meteostat endpoint
+        with open_url(
+            endpoint + path,
+            proxy,
+            timeout,
+            pool_size,
+            get_conditional_headers(meta),
+            memory_map,
+        ) as response:
+            if not response_handler(response.status, response.headers, meta):
+                response.read()
+                return None
+
+            df = read_handler(response, names, dtype, parse_dates)
+
+    except (FileNotFoundError, HTTPError) as exception:
+        df = error_handler(exception, endpoint, path, names, default_df, meta)
+
+    # Return DataFrame
+    return df
+
 
-        # Set a proxy
-        if proxy:
-            handlers.append(ProxyHandler({"http": proxy, "https": proxy}))
+async def stream_handler(
+    chunks: AsyncIterator[bytes],
+    names: Optional[List] = None,
+    dtype: Optional[dict] = None,
+    parse_dates: Optional[List] = None,
+) -> pd.DataFrame:
+    """
+    Decompress and parse a gzipped CSV file in a separate thread while its
+    chunks are received
+    """
+
+    stream = ChunkStream()
+    parsing = asyncio.ensure_future(
+        thread_handler(read_handler, stream, names, dtype, parse_dates)
+    )
+
+    try:
+        async for chunk in chunks:
+            stream.put(chunk)
+    except BaseException:
+        stream.put(None)
+        await asyncio.gather(parsing, return_exceptions=True)
+        raise
 
+    stream.put(None)
+
+    return await parsing
+
+
+async def async_load_handler(
+    session: AsyncSession,
+    endpoint: str,
+    path: str,
+    names: Optional[List] = None,
+    dtype: Optional[dict] = None,
+    parse_dates: Optional[List] = None,
+    default_df: Optional[pd.DataFrame] = None,
+    meta: Optional[dict] = None,
+    memory_map: bool = False,
+) -> Optional[pd.DataFrame]:
+    """
+    Load a single CSV file into a DataFrame without blocking the event loop
+    """
+
+    # Local files are read in a separate thread
+    if not is_remote(endpoint):
+        return await thread_handler(
+            load_handler,
+            endpoint,
+            path,
+            names=names,
+            dtype=dtype,
+            parse_dates=parse_dates,
+            default_df=default_df,
+            meta=meta,
+            memory_map=memory_map,
+        )
+
+    try:
         # Read CSV file from Meteostat endpoint
-        with build_opener(*handlers).open(Request(endpoint + path)) as response:
-            # Decompress the content
-            with GzipFile(fileobj=BytesIO(response.read()), mode="rb") as file:
-                df = pd.read_csv(
-                    file,
-                    names=names,
-                    dtype=dtype,
-                    parse_dates=parse_dates,
-                )
-
-    except (FileNotFoundError, HTTPError):
-        df = default_df if default_df is not None else pd.DataFrame(columns=names)
-
-        # Display warning
-        warn(f"Cannot load {path} from {endpoint}")
+        async with session.stream(endpoint + path, get_conditional_headers(meta)) as (
+            status,
+            headers,
+            chunks,
+        ):
+            if not response_handler(status, headers, meta):
+                return None
+
+            df = await stream_handler(chunks, names, dtype, parse_dates)
+
+    except (FileNotFoundError, HTTPError) as exception:
+        df = error_handler(exception, endpoint, path, names, default_df, meta)
 
     # Return DataFrame
     return df
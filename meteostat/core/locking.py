@@ -0,0 +1,127 @@
+"""
+Core Class - File Locking
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Interval in seconds for polling a lock
+POLL_INTERVAL = 0.05
+
+
+class FileLock:
+    """
+    An exclusive lock which is shared across processes and threads
+
+    Without a path, the lock doesn't lock anything. On file systems which
+    don't support locking, the lock is always acquired.
+    """
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def _lock(self, fd: int, blocking: bool) -> None:
+        """
+        Lock a file descriptor
+        """
+
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return
+
+        while True:  # pragma: no cover
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError as exception:
+                if not blocking:
+                    raise BlockingIOError() from exception
+                time.sleep(POLL_INTERVAL)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock, returning False if it's held by someone else
+        and blocking is disabled
+        """
+
+        if self.path is None:
+            return True
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            self._lock(fd, blocking)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        except OSError:
+            # Locking is not supported
+            os.close(fd)
+            return True
+
+        self._fd = fd
+
+        return True
+
+    def release(self) -> None:
+        """
+        Release the lock
+        """
+
+        if self._fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:  # pragma: no cover
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+@asynccontextmanager
+async def async_file_lock(path: Optional[str]) -> AsyncIterator[FileLock]:
+    """
+    Acquire a file lock without blocking the event loop
+    """
+
+    lock = FileLock(path)
+
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(POLL_INTERVAL)
+
+    try:
+        yield lock
+    finally:
+        lock.release()
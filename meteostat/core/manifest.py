@@ -0,0 +1,424 @@
+"""
+Core Class - Cache Manifest
+
+An index of all cache entries, which allows finding expired and least
+recently used entries without scanning the cache directory
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+# File name of the manifest within the cache directory
+MANIFEST_FILE = "manifest.db"
+
+# Version of the database schema
+SCHEMA_VERSION = 1
+
+# Database schema
+# The manifest is only an index, so outdated versions are dropped and
+# rebuilt from the cache directory
+SCHEMA = f"""
+BEGIN IMMEDIATE;
+DROP TABLE IF EXISTS entries;
+DROP TABLE IF EXISTS subdirs;
+DROP TABLE IF EXISTS totals;
+CREATE TABLE entries (
+    subdir TEXT NOT NULL,
+    file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    atime REAL NOT NULL,
+    ttl REAL NOT NULL,
+    expires REAL NOT NULL,
+    revalidate INTEGER NOT NULL,
+    PRIMARY KEY (subdir, file)
+);
+CREATE INDEX entries_expires ON entries (subdir, revalidate, expires);
+CREATE INDEX entries_mtime ON entries (subdir, mtime);
+CREATE INDEX entries_atime ON entries (subdir, atime);
+CREATE INDEX entries_global_atime ON entries (atime);
+CREATE TABLE subdirs (
+    subdir TEXT PRIMARY KEY,
+    scanned REAL NOT NULL
+);
+CREATE TABLE totals (
+    subdir TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+CREATE TRIGGER entries_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO totals VALUES (NEW.subdir, NEW.size)
+    ON CONFLICT (subdir) DO UPDATE SET size = size + NEW.size;
+END;
+CREATE TRIGGER entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size WHERE subdir = NEW.subdir;
+END;
+CREATE TRIGGER entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size WHERE subdir = OLD.subdir;
+END;
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
+
+# Interval in seconds for writing buffered access times
+ACCESS_INTERVAL = 60
+
+# Database connections of the current thread
+_local = threading.local()
+
+# Buffered access times by cache directory, subdirectory and file name
+_accessed: dict = {}
+
+# Time of the last write of buffered access times
+_flushed = time.time()  # pylint: disable=invalid-name
+
+# Lock for the buffered access times
+_accessed_lock = threading.Lock()
+
+
+def _reset_connections() -> None:
+    """
+    Drop inherited connections and access times in a forked child process
+    """
+
+    global _local, _accessed, _accessed_lock  # pylint: disable=global-statement
+
+    _local = threading.local()
+    _accessed = {}
+    _accessed_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_connections)
+
+
+def _connect(cache_dir: str) -> sqlite3.Connection:
+    """
+    Get the manifest connection of the current thread
+    """
+
+    connections = _local.__dict__.setdefault("connections", {})
+
+    if cache_dir not in connections:
+        os.makedirs(cache_dir, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(cache_dir, MANIFEST_FILE), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.executescript(SCHEMA)
+        connections[cache_dir] = conn
+
+    return connections[cache_dir]
+
+
+def _split(path: str) -> tuple:
+    """
+    Split the path of a cache entry into cache directory, subdirectory and
+    file name
+    """
+
+    directory, file = os.path.split(path)
+    cache_dir, subdir = os.path.split(directory)
+
+    return cache_dir, subdir, file
+
+
+def _get_size(path: str) -> int:
+    """
+    Get the size of a cache entry including its metadata
+    """
+
+    return sum(
+        os.path.getsize(file) for file in (path, f"{path}.meta") if os.path.isfile(file)
+    )
+
+
+def manifest_add(
+    path: str, ttl: float, revalidate: bool = False, mtime: Optional[float] = None
+) -> None:
+    """
+    Add or replace a cache entry
+
+    The entry expires `ttl` seconds after it was written (defaults to now).
+    Entries which can be revalidated are kept for an additional grace period.
+    """
+
+    cache_dir, subdir, file = _split(path)
+    now = time.time() if mtime is None else mtime
+
+    try:
+        conn = _connect(cache_dir)
+        with conn:
+            conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (subdir, file) DO UPDATE SET size = excluded.size, "
+                "mtime = excluded.mtime, atime = excluded.atime, ttl = excluded.ttl, "
+                "expires = excluded.expires, revalidate = excluded.revalidate",
+                (
+                    subdir,
+                    file,
+                    _get_size(path),
+                    now,
+                    now,
+                    ttl,
+                    now + ttl,
+                    int(revalidate),
+                ),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def manifest_touch(path: str) -> None:
+    """
+    Mark a cache entry as fresh
+    """
+
+    cache_dir, subdir, file = _split(path)
+    now = time.time()
+
+    try:
+        conn = _connect(cache_dir)
+        with conn:
+            conn.execute(
+                "UPDATE entries SET mtime = ?, atime = ?, expires = ? + ttl "
+                "WHERE subdir = ? AND file = ?",
+                (now, now, now, subdir, file),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def manifest_access(path: str) -> None:
+    """
+    Remember that a cache entry was read
+
+    Access times are buffered and written at most every ACCESS_INTERVAL
+    seconds, so reads don't compete for the manifest's write lock.
+    """
+
+    global _flushed  # pylint: disable=global-statement
+
+    cache_dir, subdir, file = _split(path)
+    now = time.time()
+
+    with _accessed_lock:
+        _accessed.setdefault(cache_dir, {})[(subdir, file)] = now
+
+        if now - _flushed < ACCESS_INTERVAL:
+            return
+
+        _flushed = now
+
+    manifest_flush()
+
+
+def manifest_flush(cache_dir: Optional[str] = None) -> None:
+    """
+    Write buffered access times (of a single cache directory) to the manifest
+    """
+
+    with _accessed_lock:
+        if cache_dir is None:
+            pending = list(_accessed.items())
+            _accessed.clear()
+        else:
+            pending = [(cache_dir, _accessed.pop(cache_dir, {}))]
+
+    for directory, accessed in pending:
+        try:
+            conn = _connect(directory)
+            with conn:
+                conn.executemany(
+                    "UPDATE entries SET atime = MAX(atime, ?) "
+                    "WHERE subdir = ? AND file = ?",
+                    (
+                        (atime, subdir, file)
+                        for (subdir, file), atime in accessed.items()
+                    ),
+                )
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(manifest_flush)
+
+
+def manifest_remove(cache_dir: str, entries: List[Tuple[str, str]]) -> None:
+    """
+    Remove cache entries (subdirectory and file name) from the manifest
+    """
+
+    conn = _connect(cache_dir)
+    with conn:
+        conn.executemany("DELETE FROM entries WHERE subdir = ? AND file = ?", entries)
+
+
+def manifest_scan(
+    cache_dir: str, subdir: str, max_age: int, missing_max_age: int
+) -> None:
+    """
+    Add the existing files of a cache subdirectory to the manifest
+
+    The directory is scanned only once, when it's used with the manifest
+    for the first time.
+    """
+
+    conn = _connect(cache_dir)
+
+    if conn.execute("SELECT 1 FROM subdirs WHERE subdir = ?", (subdir,)).fetchone():
+        return
+
+    directory = os.path.join(cache_dir, subdir)
+    files = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+    entries = []
+
+    for file in files:
+        # Metadata is indexed along with its file, locks aren't indexed
+        if (file.endswith(".meta") and file[:-5] in files) or file.endswith(".lock"):
+            continue
+
+        path = os.path.join(directory, file)
+        mtime = os.path.getmtime(path)
+
+        # Files which are known to be missing
+        if file.endswith(".meta"):
+            entries.append((file[:-5], mtime, missing_max_age, False))
+        else:
+            entries.append((file, mtime, max_age, f"{file}.meta" in files))
+
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    subdir,
+                    file,
+                    _get_size(os.path.join(directory, file)),
+                    mtime,
+                    mtime,
+                    ttl,
+                    mtime + ttl,
+                    int(revalidate),
+                )
+                for file, mtime, ttl, revalidate in entries
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO subdirs VALUES (?, ?)",
+            (subdir, time.time()),
+        )
+
+
+def manifest_expired(
+    cache_dir: str,
+    subdir: str,
+    max_age: Optional[int] = None,
+    grace: int = 0,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """
+    Get the file names of expired cache entries
+
+    If max_age is passed, all entries which are older than max_age are
+    returned. Otherwise, entries expire after their TTL plus the grace
+    period if they can be revalidated.
+    """
+
+    conn = _connect(cache_dir)
+    now = time.time()
+    limit = -1 if limit is None else limit
+
+    if max_age is not None:
+        rows = conn.execute(
+            "SELECT file FROM entries WHERE subdir = ? AND mtime < ? LIMIT ?",
+            (subdir, now - max_age, limit),
+        )
+    else:
+        rows = conn.execute(
+            "SELECT file FROM entries WHERE subdir = ? AND revalidate = 0 "
+            "AND expires < ? UNION ALL "
+            "SELECT file FROM entries WHERE subdir = ? AND revalidate = 1 "
+            "AND expires < ? LIMIT ?",
+            (subdir, now, subdir, now - grace, limit),
+        )
+
+    return [row[0] for row in rows]
+
+
+def _select_lru(rows: Iterable[tuple], excess: int) -> tuple:
+    """
+    Select least recently used entries until their size covers the excess,
+    returning the entries and their total size
+    """
+
+    entries = []
+    size = 0
+
+    for subdir, file, entry_size in rows:
+        if size >= excess:
+            break
+        entries.append((subdir, file))
+        size += entry_size
+
+    return entries, size
+
+
+def manifest_evict(
+    cache_dir: str,
+    subdir: str,
+    max_size: Optional[int] = None,
+    max_total_size: Optional[int] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Get the least recently used cache entries (subdirectory and file name)
+    which exceed the maximum size of the subdirectory or the whole cache
+    """
+
+    conn = _connect(cache_dir)
+    entries, evicted = [], 0
+
+    if max_size is not None:
+        size = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM totals WHERE subdir = ?", (subdir,)
+        ).fetchone()[0]
+
+        if size > max_size:
+            entries, evicted = _select_lru(
+                conn.execute(
+                    "SELECT subdir, file, size FROM entries WHERE subdir = ? "
+                    "ORDER BY atime",
+                    (subdir,),
+                ),
+                size - max_size,
+            )
+
+    if max_total_size is not None:
+        size = (
+            conn.execute("SELECT COALESCE(SUM(size), 0) FROM totals").fetchone()[0]
+            - evicted
+        )
+
+        if size > max_total_size:
+            selected = set(entries)
+            entries += _select_lru(
+                (
+                    row
+                    for row in conn.execute(
+                        "SELECT subdir, file, size FROM entries ORDER BY atime"
+                    )
+                    if (row[0], row[1]) not in selected
+                ),
+                size - max_total_size,
+            )[0]
+
+    return entries
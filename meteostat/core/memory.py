@@ -0,0 +1,130 @@
+"""
+Core Class - Memory Cache
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+import pandas as pd
+
+
+class MemoryCache:
+    """
+    A thread-safe LRU cache of DataFrames with a memory budget
+    """
+
+    def __init__(self, max_size: int = 0) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits its budget
+        """
+
+        while self.size > self.max_size and self._entries:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self.size -= size
+
+    def get(
+        self, key: Hashable, max_age: Optional[float] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get a copy of a cached DataFrame which isn't older than max_age
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            # Drop expired entry
+            if entry is not None and max_age is not None:
+                if time.time() - entry[2] > max_age:
+                    del self._entries[key]
+                    self.size -= entry[1]
+                    entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return entry[0].copy()
+
+    def put(
+        self,
+        key: Hashable,
+        df: pd.DataFrame,
+        max_size: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Add a copy of a DataFrame to the cache
+
+        The timestamp defaults to the current time and is used for
+        checking the age of the entry.
+        """
+
+        size = int(df.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+
+            # Replace existing entry
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+            # DataFrame exceeds the budget
+            if size > self.max_size:
+                self._evict()
+                return
+
+            self._entries[key] = (
+                df.copy(),
+                size,
+                time.time() if timestamp is None else timestamp,
+            )
+            self.size += size
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get the number of entries, their size in bytes and the number of
+        hits and misses
+        """
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# The process-wide memory cache
+memory_cache = MemoryCache()
@@ -0,0 +1,121 @@
+"""
+Core Class - Data Sources
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.client import HTTPMessage
+from io import BytesIO
+from typing import BinaryIO, Callable, ContextManager, Dict, Iterator, Optional
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+from meteostat.core.transport import urlopen
+
+
+class FileResponse:
+    """
+    A response-like wrapper around a local file
+    """
+
+    def __init__(self, file: BinaryIO, status: int, headers: HTTPMessage) -> None:
+        self._file = file
+        self.status = status
+        self.headers = headers
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read (a part of) the file
+        """
+
+        return self._file.read(size)
+
+
+@contextmanager
+def fileopen(
+    url: str, headers: Optional[dict] = None, memory_map: bool = False
+) -> Iterator[FileResponse]:
+    """
+    Open a file from a local directory tree
+    """
+
+    path = url2pathname(urlsplit(url).path) if url.startswith("file:") else url
+
+    # Raises FileNotFoundError if the file doesn't exist
+    stat = os.stat(path)
+
+    message = HTTPMessage()
+    message["Last-Modified"] = formatdate(stat.st_mtime, usegmt=True)
+    message["Content-Length"] = str(stat.st_size)
+
+    # File was not modified
+    if headers and headers.get("If-Modified-Since") == message["Last-Modified"]:
+        yield FileResponse(BytesIO(), 304, message)
+        return
+
+    with open(path, "rb") as file:
+        # Empty files cannot be memory-mapped
+        if memory_map and stat.st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield FileResponse(mapped, 200, message)
+        else:
+            yield FileResponse(file, 200, message)
+
+
+# Custom openers by URL scheme
+_openers: Dict[str, Callable[..., ContextManager]] = {}
+
+
+def register_opener(scheme: str, opener: Callable[..., ContextManager]) -> None:
+    """
+    Register an opener for a URL scheme
+
+    The opener is called with the URL and the request headers and must
+    return a context manager which yields a response-like object with
+    `status`, `headers` and `read()`.
+    """
+
+    _openers[scheme.lower()] = opener
+
+
+def is_remote(url: str) -> bool:
+    """
+    Check if a URL points to a HTTP(S) server
+    """
+
+    return urlsplit(url).scheme.lower() in ("http", "https")
+
+
+def open_url(
+    url: str,
+    proxy: Optional[str] = None,
+    timeout: Optional[float] = None,
+    pool_size: int = 10,
+    headers: Optional[dict] = None,
+    memory_map: bool = False,
+) -> ContextManager:
+    """
+    Open a URL or local path using the matching data source
+    """
+
+    scheme = urlsplit(url).scheme.lower()
+
+    if scheme in _openers:
+        return _openers[scheme](url, headers)
+
+    if scheme in ("http", "https"):
+        return urlopen(url, proxy, timeout, pool_size, headers)
+
+    # Plain paths might include a drive letter on Windows
+    if scheme == "file" or len(scheme) <= 1:
+        return fileopen(url, headers, memory_map)
+
+    raise URLError(f"Unsupported URL scheme: {scheme}")
@@ -0,0 +1,227 @@
+"""
+Core Class - Spatial Index
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+from typing import Optional
+import numpy as np
+from meteostat.utilities.helpers import get_distance
+
+# Earth radius in meters
+EARTH_RADIUS = 6371000
+
+# Initial search radius in meters for nearest neighbour queries
+NEAREST_RADIUS = 100000
+
+# Tolerance in degrees for the bounds of a search area
+TOLERANCE = 1e-6
+
+# Number of neighbouring locations which are processed at once in
+# batch queries
+BATCH_SIZE = 64
+
+
+def get_vectors(lat, lon) -> np.ndarray:
+    """
+    Convert geographic coordinates to unit vectors
+    """
+
+    lat, lon = np.deg2rad(lat), np.deg2rad(lon)
+
+    return np.stack(
+        (np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1
+    )
+
+
+class SpatialIndex:
+    """
+    An index of geographic coordinates sorted by latitude
+
+    Queries only calculate the distance of points within the latitude band
+    and longitude range which contain the search area. Positions refer to
+    the coordinates the index was built from, points without coordinates
+    are never returned.
+    """
+
+    def __init__(self, lat, lon) -> None:
+        lat = np.asarray(lat, dtype="float64")
+        lon = np.asarray(lon, dtype="float64")
+
+        # Sort valid points by latitude
+        positions = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self._positions = positions[np.argsort(lat[positions], kind="stable")]
+        self._lat = lat[self._positions]
+        self._lon = lon[self._positions]
+        self._vectors = get_vectors(self._lat, self._lon)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _candidates(self, lat, lon, radius: float) -> np.ndarray:
+        """
+        Get the sorted positions of all points which might be within
+        the radius of any of the locations
+        """
+
+        lat, lon = np.atleast_1d(lat), np.atleast_1d(lon)
+
+        # Angular radius in degrees
+        delta = np.rad2deg(radius / EARTH_RADIUS) + TOLERANCE
+
+        # Latitude band
+        start = np.searchsorted(self._lat, lat.min() - delta, side="left")
+        stop = np.searchsorted(self._lat, lat.max() + delta, side="right")
+        candidates = np.arange(start, stop)
+
+        # Longitude range, unless the search area contains a pole
+        extreme = np.abs(lat).max()
+
+        if extreme + delta < 90 and delta < 90:
+            ratio = np.sin(np.deg2rad(delta)) / np.cos(np.deg2rad(extreme))
+            dlon = np.rad2deg(np.arcsin(min(1.0, ratio))) + TOLERANCE
+            centre = (lon.min() + lon.max()) / 2
+            diff = np.abs((self._lon[start:stop] - centre + 180) % 360 - 180)
+            candidates = candidates[diff <= (lon.max() - lon.min()) / 2 + dlon]
+
+        return candidates
+
+    def query_radius(
+        self, lat: float, lon: float, radius: float, mask: Optional[np.ndarray] = None
+    ) -> tuple:
+        """
+        Get the positions and distances of all points within the radius
+        (in meters), sorted by distance
+
+        An optional boolean mask over all positions restricts the points.
+        """
+
+        candidates = self._candidates(lat, lon, radius)
+
+        if mask is not None:
+            candidates = candidates[mask[self._positions[candidates]]]
+
+        distances = get_distance(lat, lon, self._lat[candidates], self._lon[candidates])
+
+        # Filter by radius
+        inside = distances <= radius
+        candidates, distances = candidates[inside], distances[inside]
+
+        # Sort by distance
+        order = np.argsort(distances, kind="stable")
+
+        return self._positions[candidates[order]], distances[order]
+
+    def query_nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        radius: Optional[float] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> tuple:
+        """
+        Get the positions and distances of the k nearest points, optionally
+        within a radius (in meters) and restricted by a mask, sorted by
+        distance
+        """
+
+        # Half of the earth's circumference covers all points
+        limit = np.pi * EARTH_RADIUS if radius is None else radius
+
+        # Widen the search area until it contains k points
+        search = min(NEAREST_RADIUS, limit)
+
+        while True:
+            positions, distances = self.query_radius(lat, lon, search, mask)
+            if len(positions) >= k or search >= limit:
+                return positions[:k], distances[:k]
+            search = min(search * 4, limit)
+
+    def query_nearest_batch(  # pylint: disable=too-many-locals
+        self, lat, lon, k: int, radius: Optional[float] = None
+    ) -> tuple:
+        """
+        Get the positions and distances of the k nearest points for many
+        locations at once
+
+        Returns two arrays with one row per location, sorted by distance.
+        Missing neighbours have a position of -1 and a distance of NaN.
+        """
+
+        lat = np.atleast_1d(np.asarray(lat, dtype="float64"))
+        lon = np.atleast_1d(np.asarray(lon, dtype="float64"))
+
+        positions = np.full((len(lat), k), -1, dtype="int64")
+        distances = np.full((len(lat), k), np.nan)
+        found = min(k, len(self))
+
+        if found == 0:
+            return positions, distances
+
+        # Group neighbouring locations in grid cells of about BATCH_SIZE
+        # locations each
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+
+        if len(valid) == 0:
+            return positions, distances
+
+        size = np.sqrt(
+            (np.ptp(lat[valid]) + 1)
+            * (np.ptp(lon[valid]) + 1)
+            * BATCH_SIZE
+            / len(valid)
+        )
+        cells = np.floor((lat[valid] + 90) / size) * np.ceil(361 / size)
+        cells += np.floor((lon[valid] + 180) / size)
+        order = np.argsort(cells, kind="stable")
+        groups = np.split(valid[order], np.flatnonzero(np.diff(cells[order])) + 1)
+
+        for chunk in (
+            group[start : start + BATCH_SIZE]
+            for group in groups
+            for start in range(0, len(group), BATCH_SIZE)
+        ):
+            # The k nearest points of any location are closer than those
+            # of the chunk's centre plus the distance to the centre
+            centre = chunk[len(chunk) // 2]
+            bound = self.query_nearest(lat[centre], lon[centre], found)[1][-1]
+            bound += get_distance(
+                lat[centre], lon[centre], lat[chunk], lon[chunk]
+            ).max()
+            if radius is not None:
+                bound = min(bound, radius)
+
+            candidates = self._candidates(lat[chunk], lon[chunk], bound)
+            count = min(found, len(candidates))
+
+            if count == 0:
+                continue
+
+            # The nearest points have the largest dot product
+            product = get_vectors(lat[chunk], lon[chunk]) @ self._vectors[candidates].T
+            nearest = candidates[
+                np.argpartition(-product, count - 1, axis=1)[:, :count]
+            ]
+
+            # Sort by distance
+            dist = get_distance(
+                lat[chunk, None],
+                lon[chunk, None],
+                self._lat[nearest],
+                self._lon[nearest],
+            )
+            order = np.argsort(dist, axis=1, kind="stable")
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            dist = np.take_along_axis(dist, order, axis=1)
+
+            # Filter by radius
+            inside = dist <= bound
+            positions[chunk, :count] = np.where(inside, self._positions[nearest], -1)
+            distances[chunk, :count] = np.where(inside, dist, np.nan)
+
+        return positions, distances
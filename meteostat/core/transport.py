@@ -0,0 +1,622 @@
+"""
+Core Class - HTTP Transport
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+import os
+import ssl
+import threading
+from base64 import b64encode
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from io import BytesIO
+from http.client import (
+    HTTPConnection,
+    HTTPSConnection,
+    HTTPException,
+    HTTPMessage,
+    HTTPResponse,
+    parse_headers,
+)
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import (
+    ProxyHandler,
+    Request,
+    build_opener,
+    getproxies,
+    proxy_bypass,
+)
+
+# HTTP status codes which indicate a redirect
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Maximum number of redirects per request
+MAX_REDIRECTS = 5
+
+# Number of bytes which are read from a response body at once
+CHUNK_SIZE = 65536
+
+
+def get_proxy(url: str, proxy: Optional[str] = None) -> Optional[str]:
+    """
+    Get the proxy for a URL, falling back to the proxy settings of the
+    environment (e.g. HTTP_PROXY, HTTPS_PROXY and NO_PROXY)
+    """
+
+    if proxy:
+        return proxy
+
+    parts = urlsplit(url)
+    host = parts.netloc.rsplit("@", 1)[-1]
+
+    if not host or proxy_bypass(host):
+        return None
+
+    return getproxies().get(parts.scheme.lower())
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of persistent connections to a single host
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: Optional[int] = None,
+        maxsize: int = 10,
+        proxy: Optional[str] = None,
+    ) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.proxy = urlsplit(proxy) if proxy else None
+        self._idle: List[HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _proxy_headers(self) -> Dict[str, str]:
+        """
+        Get the authorization header for the proxy (if any)
+        """
+
+        if self.proxy is None or self.proxy.username is None:
+            return {}
+
+        credentials = (
+            f"{unquote(self.proxy.username)}:{unquote(self.proxy.password or '')}"
+        )
+
+        return {
+            "Proxy-Authorization": "Basic "
+            + b64encode(credentials.encode("utf-8")).decode("ascii")
+        }
+
+    def _new_connection(self, timeout: Optional[float]) -> HTTPConnection:
+        """
+        Open a new connection to the host
+        """
+
+        if self.proxy is None:
+            if self.scheme == "https":
+                return HTTPSConnection(
+                    self.host,
+                    self.port,
+                    timeout=timeout,
+                    context=ssl.create_default_context(),
+                )
+            return HTTPConnection(self.host, self.port, timeout=timeout)
+
+        # Tunnel HTTPS requests through the proxy
+        if self.scheme == "https":
+            conn = HTTPSConnection(
+                self.proxy.hostname,
+                self.proxy.port,
+                timeout=timeout,
+                context=ssl.create_default_context(),
+            )
+            conn.set_tunnel(self.host, self.port, headers=self._proxy_headers())
+            return conn
+
+        # Plain HTTP requests are sent to the proxy directly
+        return HTTPConnection(self.proxy.hostname, self.proxy.port, timeout=timeout)
+
+    def request_target(self, path: str) -> str:
+        """
+        Get the request target for a path on this host
+        """
+
+        if self.proxy is not None and self.scheme == "http":
+            port = f":{self.port}" if self.port else ""
+            return f"http://{self.host}{port}{path}"
+
+        return path
+
+    def request_headers(self) -> Dict[str, str]:
+        """
+        Get the default request headers
+        """
+
+        headers = {"Connection": "keep-alive"}
+
+        if self.proxy is not None and self.scheme == "http":
+            headers.update(self._proxy_headers())
+
+        return headers
+
+    def get(self, timeout: Optional[float] = None) -> HTTPConnection:
+        """
+        Get an idle connection or open a new one
+        """
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is None:
+            return self._new_connection(timeout)
+
+        # Apply the timeout of the current request
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+        return conn
+
+    def put(self, conn: HTTPConnection) -> None:
+        """
+        Return a connection to the pool
+        """
+
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+
+        # Pool is full
+        conn.close()
+
+    def close(self) -> None:
+        """
+        Close all idle connections
+        """
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for conn in idle:
+            conn.close()
+
+
+# Connection pools by scheme, host, port and proxy
+_pools: Dict[tuple, ConnectionPool] = {}
+
+# Lock for the pool registry
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    scheme: str,
+    host: str,
+    port: Optional[int] = None,
+    proxy: Optional[str] = None,
+    pool_size: int = 10,
+) -> ConnectionPool:
+    """
+    Get the (shared) connection pool for a host
+    """
+
+    key = (scheme, host, port, proxy)
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(scheme, host, port, pool_size, proxy)
+        pool = _pools[key]
+
+    # Allow resizing the pool at runtime
+    pool.maxsize = pool_size
+
+    return pool
+
+
+def close_pools() -> None:
+    """
+    Close all idle connections of all pools
+    """
+
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    for pool in pools:
+        pool.close()
+
+
+def _reset_pools() -> None:
+    """
+    Drop inherited connections in a forked child process
+    """
+
+    global _pools_lock  # pylint: disable=global-statement
+
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools)
+
+
+def _send(
+    pool: ConnectionPool, path: str, headers: dict, timeout: Optional[float]
+) -> tuple:
+    """
+    Send a GET request, retrying once if a persistent connection went stale
+    """
+
+    for attempt in range(2):
+        conn = pool.get(timeout)
+        reused = conn.sock is not None
+
+        try:
+            conn.request(
+                "GET",
+                pool.request_target(path),
+                headers={**pool.request_headers(), **headers},
+            )
+            return conn, conn.getresponse()
+        except (HTTPException, ConnectionError) as exception:
+            conn.close()
+            if not reused or attempt > 0:
+                raise URLError(exception) from exception
+        except OSError as exception:
+            conn.close()
+            raise URLError(exception) from exception
+
+    # Unreachable
+    raise URLError("Request failed")
+
+
+def _release(pool: ConnectionPool, conn: HTTPConnection, response: HTTPResponse):
+    """
+    Return a connection to its pool or close it
+    """
+
+    # Only reuse connections whose response was consumed entirely
+    if response.isclosed() and not response.will_close:
+        pool.put(conn)
+    else:
+        conn.close()
+
+
+@contextmanager
+def urlopen(
+    url: str,
+    proxy: Optional[str] = None,
+    timeout: Optional[float] = None,
+    pool_size: int = 10,
+    headers: Optional[dict] = None,
+) -> Iterator[HTTPResponse]:
+    """
+    Open a URL using a persistent connection
+    """
+
+    # Other schemes (e.g. file://) are opened by urllib
+    if urlsplit(url).scheme.lower() not in ("http", "https"):
+        handlers = [ProxyHandler({"http": proxy, "https": proxy})] if proxy else []
+        options = {"timeout": timeout} if timeout is not None else {}
+
+        with build_opener(*handlers).open(
+            Request(url, headers=headers or {}), **options
+        ) as response:
+            yield response
+
+        return
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        pool = get_pool(
+            parts.scheme,
+            parts.hostname,
+            parts.port,
+            get_proxy(url, proxy),
+            pool_size,
+        )
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        conn, response = _send(pool, path or "/", headers or {}, timeout)
+
+        # Follow redirects
+        if response.status in REDIRECT_CODES and response.getheader("Location"):
+            response.read()
+            _release(pool, conn, response)
+            url = urljoin(url, response.getheader("Location"))
+            continue
+
+        # Raise HTTP errors
+        if response.status >= 400:
+            response.read()
+            _release(pool, conn, response)
+            raise HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+
+        break
+
+    else:
+        raise URLError(f"Too many redirects for {url}")
+
+    try:
+        yield response
+    finally:
+        _release(pool, conn, response)
+
+
+class AsyncSession:
+    """
+    Persistent HTTP connections for use within a single asyncio event loop
+
+    Requests which go through a proxy are sent by the pooled transport in a
+    separate thread.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: Optional[float] = None,
+        proxy: Optional[str] = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.proxy = proxy
+        self._idle: Dict[tuple, list] = {}
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    async def _connect(self, key: tuple) -> tuple:
+        """
+        Get an idle connection or open a new one
+        """
+
+        idle = self._idle.get(key)
+
+        if idle:
+            return idle.pop(), True
+
+        scheme, host, port = key
+        conn = await asyncio.open_connection(
+            host, port, ssl=ssl.create_default_context() if scheme == "https" else None
+        )
+
+        return conn, False
+
+    def _release(self, key: tuple, conn: tuple, reusable: bool) -> None:
+        """
+        Return a connection to the session or close it
+        """
+
+        idle = self._idle.setdefault(key, [])
+
+        if reusable and len(idle) < self.pool_size:
+            idle.append(conn)
+        else:
+            conn[1].close()
+
+    async def _wait(self, awaitable: Awaitable) -> Any:
+        """
+        Wait for a single read from a connection, applying the timeout
+        """
+
+        try:
+            return await asyncio.wait_for(awaitable, self.timeout)
+        except (OSError, EOFError, asyncio.TimeoutError) as exception:
+            raise URLError(exception) from exception
+
+    async def _read_body(
+        self,
+        reader: asyncio.StreamReader,
+        status: int,
+        headers: HTTPMessage,
+        state: dict,
+    ) -> AsyncIterator[bytes]:
+        """
+        Read a response body in chunks
+
+        Once the body was read entirely, the state tells whether the
+        connection can be reused.
+        """
+
+        if status in (204, 304) or 100 <= status < 200:
+            state["complete"] = True
+            return
+
+        if "chunked" in headers.get("Transfer-Encoding", "").lower():
+            while True:
+                size = int((await self._wait(reader.readline())).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers
+                    while (await self._wait(reader.readline())) not in (
+                        b"\r\n",
+                        b"\n",
+                        b"",
+                    ):
+                        pass
+                    state["complete"] = True
+                    return
+                yield await self._wait(reader.readexactly(size))
+                await self._wait(reader.readexactly(2))
+
+        if headers.get("Content-Length") is not None:
+            remaining = int(headers["Content-Length"])
+            while remaining > 0:
+                chunk = await self._wait(reader.read(min(remaining, CHUNK_SIZE)))
+                if not chunk:
+                    raise URLError("Connection closed before end of body")
+                remaining -= len(chunk)
+                yield chunk
+            state["complete"] = True
+            return
+
+        # The body ends with the connection
+        while chunk := await self._wait(reader.read(CHUNK_SIZE)):
+            yield chunk
+
+    async def _read_head(self, reader: asyncio.StreamReader) -> tuple:
+        """
+        Read the status line and headers of a response, returning its status,
+        reason, headers and whether the connection is kept alive
+        """
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by remote host")
+
+        version, status, *reason = status_line.decode("latin-1").split(" ", 2)
+
+        lines = []
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            lines.append(line)
+        message = parse_headers(BytesIO(b"".join(lines)))
+
+        connection = message.get("Connection", "").lower()
+        keep_alive = connection == "keep-alive" or (
+            version == "HTTP/1.1" and connection != "close"
+        )
+
+        return int(status), "".join(reason).strip(), message, keep_alive
+
+    async def _request(self, url: str, headers: dict) -> tuple:
+        """
+        Send a single GET request, returning the connection key, the
+        connection and the head of the response
+        """
+
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            + "\r\n"
+        ).encode("latin-1")
+
+        for attempt in range(2):
+            conn, reused = await self._connect(key)
+
+            try:
+                conn[1].write(request)
+                await conn[1].drain()
+
+                return (key, conn, *await self._read_head(conn[0]))
+
+            except (ConnectionError, asyncio.IncompleteReadError) as exception:
+                conn[1].close()
+                if not reused or attempt > 0:
+                    raise URLError(exception) from exception
+            except BaseException:
+                conn[1].close()
+                raise
+
+        # Unreachable
+        raise URLError("Request failed")
+
+    def _get_proxied(self, url: str, headers: dict) -> tuple:
+        """
+        Get the status, headers and body of a URL through a proxy
+        """
+
+        with urlopen(
+            url, self.proxy, self.timeout, self.pool_size, headers
+        ) as response:
+            return response.status, response.headers, response.read()
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, headers: Optional[dict] = None
+    ) -> AsyncIterator[tuple]:
+        """
+        Open a URL, yielding the status, the headers and an asynchronous
+        iterator over the chunks of the body
+
+        Bodies of responses which go through a proxy are read at once.
+        """
+
+        if get_proxy(url, self.proxy):
+            loop = asyncio.get_running_loop()
+            status, message, body = await loop.run_in_executor(
+                None, partial(self._get_proxied, url, headers or {})
+            )
+
+            async def chunks() -> AsyncIterator[bytes]:
+                yield body
+
+            yield status, message, chunks()
+            return
+
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                key, conn, status, reason, message, keep_alive = await asyncio.wait_for(
+                    self._request(url, headers or {}), self.timeout
+                )
+            except (OSError, asyncio.TimeoutError) as exception:
+                if isinstance(exception, URLError):
+                    raise
+                raise URLError(exception) from exception
+
+            state = {"complete": False}
+            chunks = self._read_body(conn[0], status, message, state)
+
+            try:
+                # Follow redirects
+                if status in REDIRECT_CODES and message.get("Location"):
+                    async for _ in chunks:
+                        pass
+                    url = urljoin(url, message["Location"])
+                    continue
+
+                # Raise HTTP errors
+                if status >= 400:
+                    async for _ in chunks:
+                        pass
+                    raise HTTPError(url, status, reason, message, None)
+
+                yield status, message, chunks
+                return
+
+            finally:
+                # Only reuse connections whose response was consumed entirely
+                self._release(key, conn, keep_alive and state["complete"])
+
+        raise URLError(f"Too many redirects for {url}")
+
+    async def get(self, url: str, headers: Optional[dict] = None) -> tuple:
+        """
+        Get the status, headers and body of a URL
+        """
+
+        async with self.stream(url, headers) as (status, message, chunks):
+            return status, message, b"".join([chunk async for chunk in chunks])
+
+    def close(self) -> None:
+        """
+        Close all idle connections
+        """
+
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+
+        self._idle = {}
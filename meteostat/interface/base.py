@@ -18,22 +18,82 @@ class Base:
     """
 
     # Base URL of the Meteostat bulk data interface
+    # This might also be a file:// URL or path of a local mirror
     endpoint = "https://bulk.meteostat.net/v2/"
 
     # Proxy URL for the Meteostat (bulk) data interface
     proxy: Optional[str] = None
 
+    # Timeout of a single HTTP request in seconds
+    timeout: Optional[float] = 30
+
+    # Maximum number of persistent connections per host
+    pool_size = 10
+
+    # Memory-map files of a local mirror and Feather files in the cache?
+    memory_map = False
+
     # Location of the cache directory
     cache_dir = os.path.expanduser("~") + os.sep + ".meteostat" + os.sep + "cache"
 
+    # Location of a shared, read-only cache directory (e.g. on a network drive)
+    # Its entries are copied to the local cache on first use
+    shared_cache_dir: Optional[str] = None
+
+    # Format of cached DataFrames
+    # Feather files require pyarrow, otherwise pickle files are written
+    cache_format = "feather"
+
+    # Compression of Feather files in the cache ("lz4", "zstd" or None)
+    # Compressed files are smaller, but need to be decompressed when read
+    cache_compression: Optional[str] = None
+
+    # Compression level (None for the codec's default)
+    cache_compression_level: Optional[int] = None
+
     # Auto clean cache directories?
     autoclean = True
 
+    # Maximum size of the in-memory cache in bytes (0 to disable)
+    # The memory cache is shared by all instances within a process
+    memory_cache_size = 0
+
+    # Maximum number of expired files removed by a single auto clean
+    autoclean_limit = 1000
+
+    # Maximum size of the cache subdirectory in bytes (None for no limit)
+    max_cache_size: Optional[int] = None
+
+    # Maximum size of the whole cache directory in bytes (None for no limit)
+    max_total_cache_size: Optional[int] = None
+
     # Maximum age of a cached file in seconds
     max_age = 24 * 60 * 60
 
+    # Maximum age in seconds of cached files which cover a completed year
+    # (None to use max_age, math.inf to never refresh them)
+    historical_max_age: Optional[float] = None
+
+    # Period in seconds after the end of a year before its files are
+    # considered historical
+    historical_horizon = 30 * 24 * 60 * 60
+
+    # Period in seconds after max_age for which expired files are still used
+    # while they are refreshed in the background (0 to always wait for
+    # the refresh)
+    stale_while_revalidate = 0
+
+    # Period in seconds for which expired files are kept for revalidation
+    revalidation_period = 30 * 24 * 60 * 60
+
+    # Maximum age in seconds of the information that a file is missing
+    missing_max_age = 24 * 60 * 60
+
     # Number of processes used for processing files
     processes = 1
 
     # Number of threads used for processing files
     threads = 1
+
+    # Maximum number of concurrent downloads when loading asynchronously
+    concurrency = 100
@@ -11,11 +11,40 @@ under the terms of the Creative Commons Attribution-NonCommercial
 The code is licensed under the MIT license.
 """
 
-from collections.abc import Callable
-from typing import Dict, List, Union
+import os
+import time
+from collections.abc import Callable, Generator
+from contextlib import AsyncExitStack, ExitStack
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 from meteostat.enumerations.granularity import Granularity
-from meteostat.core.loader import processing_handler
+from meteostat.core.cache import (
+    file_in_cache,
+    file_missing,
+    get_local_file_path,
+    lock_path,
+    promote_cache,
+    read_cache,
+    read_cache_meta,
+    touch_cache,
+    write_cache,
+    write_cache_missing,
+)
+from meteostat.core.locking import FileLock, async_file_lock
+from meteostat.core.manifest import manifest_access
+from meteostat.core.memory import memory_cache
+from meteostat.core.loader import (
+    async_load_handler,
+    async_processing_handler,
+    background_handler,
+    load_handler,
+    processing_handler,
+    thread_handler,
+)
+from meteostat.core.transport import AsyncSession
+from meteostat.utilities.endpoint import generate_endpoint_path
 from meteostat.utilities.mutations import adjust_temp
 from meteostat.utilities.aggregations import weighted_average
 from meteostat.interface.base import Base
@@ -33,6 +62,18 @@ class MeteoData(Base):
     # The data frame
     _data: pd.DataFrame = pd.DataFrame()
 
+    # The geo point (if any)
+    _point: Optional[Any] = None
+
+    # The weather stations which are used for the geo point
+    _point_stations: Optional[pd.DataFrame] = None
+
+    # Defer data retrieval to the asynchronous loader?
+    _deferred = False
+
+    # Column names of a raw data dump (if the file has no header)
+    _names: Optional[List[str]] = None
+
     @property
     def _raw_columns(self) -> List[str]:
         """
@@ -87,6 +128,386 @@ class MeteoData(Base):
             if isinstance(v, Callable)
         }
 
+    @property
+    def _cache_columns(self) -> Optional[List[str]]:
+        """
+        Get the list of columns which are read from the cache (None for all)
+        """
+
+        return None
+
+    @property
+    def _cache_columns_key(self) -> Optional[tuple]:
+        """
+        Get the cached columns as a hashable key
+        """
+
+        columns = self._cache_columns
+
+        return None if columns is None else tuple(columns)
+
+    @property
+    def _default_df(self) -> pd.DataFrame:
+        """
+        Get an empty raw data dump
+        """
+
+        return pd.DataFrame(columns=self._names)
+
+    def _get_max_age(self, year: Optional[int] = None) -> float:
+        """
+        Get the maximum age of a cached data dump covering the given year
+        """
+
+        if year is None or self.max_age <= 0 or self.historical_max_age is None:
+            return self.max_age
+
+        # End of the year in seconds since the epoch
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp()
+
+        if time.time() - end < self.historical_horizon:
+            return self.max_age
+
+        return max(self.max_age, self.historical_max_age)
+
+    def _read_cache(self, path: str, max_age: float) -> Optional[pd.DataFrame]:
+        """
+        Read a fresh data dump from the memory or disk cache
+        """
+
+        if max_age <= 0:
+            return None
+
+        # Check memory cache
+        if self.memory_cache_size > 0:
+            df = memory_cache.get((path, self._cache_columns_key), max_age)
+            if df is not None:
+                # Keep the disk cache entry from being evicted
+                manifest_access(path)
+                return df
+
+        # Check disk cache, falling back to the shared cache
+        if not file_in_cache(path, max_age) and not (
+            self._promote(path, max_age) and file_in_cache(path, max_age)
+        ):
+            return None
+
+        df = read_cache(path, self._cache_columns, self.memory_map)
+        self._memorize(path, df, os.path.getmtime(path))
+
+        return df
+
+    def _promote(self, path: str, max_age: float) -> bool:
+        """
+        Copy a newer cache entry from the shared cache to the local cache
+        """
+
+        if self.shared_cache_dir is None:
+            return False
+
+        return promote_cache(
+            os.path.join(
+                self.shared_cache_dir, self.cache_subdir, os.path.basename(path)
+            ),
+            path,
+            max_age,
+        )
+
+    def _get_cached(
+        self, path: str, max_age: float, dataset: Optional[tuple] = None
+    ) -> tuple:
+        """
+        Get a data dump from the cache, returning the DataFrame (None if the
+        file is missing) and whether the cache entry can be used
+
+        If a dataset is passed, stale entries might be used while the dataset
+        is refreshed in the background.
+        """
+
+        df = self._read_cache(path, max_age)
+
+        if df is not None:
+            return df, True
+
+        # Serve stale data and refresh it in the background
+        if (
+            dataset is not None
+            and self.stale_while_revalidate > 0
+            and file_in_cache(path, max_age + self.stale_while_revalidate)
+        ):
+            background_handler(path, self._prefetch_file, *dataset)
+            return read_cache(path, self._cache_columns, self.memory_map), True
+
+        return None, self.max_age > 0 and file_missing(path, self.missing_max_age)
+
+    def _get_lock_path(self, path: str) -> Optional[str]:
+        """
+        Get the path of the lock file for downloading a data dump
+        """
+
+        return lock_path(path) if self.max_age > 0 else None
+
+    def _memorize(
+        self, path: str, df: pd.DataFrame, timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Add a processed data dump to the memory cache
+        """
+
+        if self.memory_cache_size > 0:
+            if self._cache_columns is not None:
+                df = df[df.columns.intersection(self._cache_columns)]
+
+            memory_cache.put(
+                (path, self._cache_columns_key),
+                df,
+                self.memory_cache_size,
+                timestamp,
+            )
+
+    def _load_steps(self, station: str, year: Optional[int] = None) -> Generator:
+        """
+        Load file for a single station from the cache or Meteostat
+
+        The steps are shared by the synchronous and asynchronous loader. They
+        yield requests which the loader fulfils: ("lock", path) to hold a lock
+        until all steps are done and ("download", file, meta) to download a
+        file, whose DataFrame is sent back. The filtered DataFrame is returned.
+        """
+
+        # File name
+        file = generate_endpoint_path(self.granularity, station, year)
+
+        # Get local file path
+        path = get_local_file_path(self.cache_dir, self.cache_subdir, file)
+
+        # Maximum age of the cache entry
+        max_age = self._get_max_age(year)
+
+        # Read cached data
+        df, fresh = self._get_cached(path, max_age, (station, year))
+
+        # File which was found missing by this request
+        missing = None
+
+        if not fresh:
+            # Only one process downloads a file at a time
+            yield ("lock", self._get_lock_path(path))
+
+            # The file might have been downloaded in the meantime
+            df, fresh = self._get_cached(path, max_age)
+
+            if not fresh:
+                # Metadata of an expired cache entry
+                meta = read_cache_meta(path) if self.max_age > 0 else {}
+
+                # Get data from Meteostat
+                df = yield ("download", file, meta)
+
+                df = self._store_file(path, df, station, meta, max_age)
+                missing = file if df is None else None
+
+        return self._filter_file(df, station, missing)
+
+    @staticmethod
+    def _advance(steps: Generator, value: Any = None) -> tuple:
+        """
+        Run the loading steps until the next request, returning whether they
+        are done and the request or the result
+        """
+
+        try:
+            return False, steps.send(value)
+        except StopIteration as result:
+            return True, result.value
+
+    def _load_data(self, station: str, year: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load file for a single station from Meteostat
+        """
+
+        steps = self._load_steps(station, year)
+
+        with ExitStack() as stack:
+            done, request = self._advance(steps)
+
+            while not done:
+                if request[0] == "lock":
+                    stack.enter_context(FileLock(request[1]))
+                    value = None
+                else:
+                    value = load_handler(
+                        self.endpoint,
+                        request[1],
+                        self.proxy,
+                        self._names,
+                        default_df=self._default_df,
+                        timeout=self.timeout,
+                        pool_size=self.pool_size,
+                        meta=request[2],
+                        memory_map=self.memory_map,
+                    )
+
+                done, request = self._advance(steps, value)
+
+        return request
+
+    async def _load_data_async(
+        self,
+        station: str,
+        year: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> pd.DataFrame:
+        """
+        Asynchronously load file for a single station from Meteostat
+
+        All steps except for waiting on the lock and downloading the file run
+        in a separate thread.
+        """
+
+        steps = self._load_steps(station, year)
+
+        async with AsyncExitStack() as stack:
+            done, request = await thread_handler(self._advance, steps)
+
+            while not done:
+                if request[0] == "lock":
+                    await stack.enter_async_context(async_file_lock(request[1]))
+                    value = None
+                else:
+                    value = await async_load_handler(
+                        session,
+                        self.endpoint,
+                        request[1],
+                        self._names,
+                        default_df=self._default_df,
+                        meta=request[2],
+                        memory_map=self.memory_map,
+                    )
+
+                done, request = await thread_handler(self._advance, steps, value)
+
+        return request
+
+    def _prefetch_file(self, station: str, year: Optional[int] = None) -> tuple:
+        """
+        Make sure the data dump of a single station is cached, returning
+        the outcome and the size of the cache entry in bytes
+        """
+
+        # File name
+        file = generate_endpoint_path(self.granularity, station, year)
+
+        # Get local file path
+        path = get_local_file_path(self.cache_dir, self.cache_subdir, file)
+
+        # Maximum age of the cache entry
+        max_age = self._get_max_age(year)
+
+        # Only one process downloads a file at a time
+        with FileLock(self._get_lock_path(path)):
+            # Skip files which are still fresh
+            if file_in_cache(path, max_age) or file_missing(path, self.missing_max_age):
+                return "skipped", 0
+
+            # Metadata of an expired cache entry
+            meta = read_cache_meta(path)
+
+            try:
+                df = load_handler(
+                    self.endpoint,
+                    file,
+                    self.proxy,
+                    self._names,
+                    default_df=self._default_df,
+                    timeout=self.timeout,
+                    pool_size=self.pool_size,
+                    meta=meta,
+                    memory_map=self.memory_map,
+                )
+            except OSError:
+                return "failed", 0
+
+            # Cached file was not modified
+            if df is None:
+                touch_cache(path)
+                return "revalidated", 0
+
+            # File couldn't be loaded
+            if self._store_file(path, df, station, meta, max_age) is None:
+                return ("missing" if meta["status"] in (404, 410) else "failed"), 0
+
+            return "downloaded", os.path.getsize(path)
+
+    def _store_file(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        df: Optional[pd.DataFrame],
+        station: str,
+        meta: dict,
+        max_age: Optional[float] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Process a downloaded data dump and save it to the cache
+        """
+
+        # Cached file was not modified
+        if df is None:
+            touch_cache(path)
+            df = read_cache(path, self._cache_columns, self.memory_map)
+            self._memorize(path, df)
+            return df
+
+        # File couldn't be loaded
+        if meta.get("status", 200) >= 400:
+            # Remember missing file
+            if self.max_age > 0 and meta["status"] in (404, 410):
+                write_cache_missing(path, self.missing_max_age)
+            return None
+
+        # Prepare data for further processing
+        df = self._process_file(df, station)
+
+        # Save to cache
+        if self.max_age > 0:
+            write_cache(
+                path,
+                df,
+                meta,
+                self.cache_format,
+                self.max_age if max_age is None else max_age,
+                self.cache_compression,
+                self.cache_compression_level,
+            )
+            self._memorize(path, df)
+
+        return df
+
+    def _filter_file(
+        self, df: Optional[pd.DataFrame], station: str, missing: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Filter a data dump, substituting missing files with an empty DataFrame
+
+        Only files which were found missing by the current request are
+        reported, files known to be missing from the cache are not.
+        """
+
+        if df is None:
+            df = self._process_file(self._default_df, station)
+            if missing is not None:
+                df.attrs["missing"] = missing
+            return df
+
+        return self._filter_period(df)
+
+    def _get_annual_steps(self, _station: str) -> list:
+        """
+        Get the years for which data of a weather station is loaded
+        """
+
+        return self._annual_steps
+
     def _get_datasets(self) -> list:
         """
         Get list of datasets
@@ -96,7 +517,7 @@ class MeteoData(Base):
             datasets = [
                 (str(station), year)
                 for station in self._stations
-                for year in self._annual_steps
+                for year in self._get_annual_steps(str(station))
             ]
         else:
             datasets = [(str(station),) for station in self._stations]
@@ -108,10 +529,10 @@ class MeteoData(Base):
         Get all required data dumps
         """
 
-        if len(self._stations) > 0:
-            # Get list of datasets
-            datasets = self._get_datasets()
+        # Get list of datasets
+        datasets = self._get_datasets() if len(self._stations) > 0 else []
 
+        if len(datasets) > 0:
             # Data Processings
             return processing_handler(
                 datasets, self._load_data, self.processes, self.threads
@@ -120,6 +541,59 @@ class MeteoData(Base):
         # Empty DataFrame
         return pd.DataFrame(columns=self._processed_columns)
 
+    async def _get_data_async(self) -> pd.DataFrame:
+        """
+        Get all required data dumps without blocking the event loop
+        """
+
+        # Get list of datasets
+        datasets = self._get_datasets() if len(self._stations) > 0 else []
+
+        if len(datasets) > 0:
+            # Data Processings
+            async with AsyncSession(
+                self.pool_size, self.timeout, self.proxy
+            ) as session:
+                return await async_processing_handler(
+                    datasets,
+                    partial(self._load_data_async, session=session),
+                    self.concurrency,
+                )
+
+        # Empty DataFrame
+        return pd.DataFrame(columns=self._processed_columns)
+
+    @classmethod
+    def _init_deferred(cls, *args, **kwargs) -> "MeteoData":
+        """
+        Create an instance without retrieving any data
+        """
+
+        instance = cls.__new__(cls)
+        instance._deferred = True
+        instance.__init__(*args, **kwargs)  # pylint: disable=unnecessary-dunder-call
+        instance._deferred = False
+
+        return instance
+
+    @classmethod
+    async def load_async(cls, *args, **kwargs) -> "MeteoData":
+        """
+        Create an instance and retrieve its data asynchronously
+        """
+
+        # Initialize instance without retrieving any data, looking up
+        # weather stations in a separate thread
+        instance = await thread_handler(cls._init_deferred, *args, **kwargs)
+
+        # Get data for all weather stations
+        instance._data = await instance._get_data_async()
+
+        # Process data in a separate thread
+        await thread_handler(instance._process_data)
+
+        return instance
+
     # pylint: disable=too-many-branches
     def _resolve_point(
         self, method: str, stations: pd.DataFrame, alt: int, adapt_temp: bool
@@ -13,9 +13,6 @@ from typing import Optional, Union
 from datetime import datetime
 import numpy as np
 import pandas as pd
-from meteostat.core.cache import file_in_cache, get_local_file_path
-from meteostat.core.loader import load_handler
-from meteostat.utilities.endpoint import generate_endpoint_path
 from meteostat.enumerations.granularity import Granularity
 from meteostat.core.warn import warn
 from meteostat.interface.meteodata import MeteoData
@@ -65,42 +62,33 @@ class Normals(MeteoData):
     # Which columns should be parsed as dates?
     _parse_dates = None
 
-    def _load_data(self, station: str, year: Optional[int] = None) -> None:
+    @property
+    def _names(self) -> list:
         """
-        Load file for a single station from Meteostat
+        Get the column names of a raw data dump
         """
 
-        # File name
-        file = generate_endpoint_path(self.granularity, station, year)
+        return self._columns
 
-        # Get local file path
-        path = get_local_file_path(self.cache_dir, self.cache_subdir, file)
-
-        # Check if file in cache
-        if self.max_age > 0 and file_in_cache(path, self.max_age):
-            # Read cached data
-            df = pd.read_pickle(path)
+    def _process_file(self, df: pd.DataFrame, station: str) -> pd.DataFrame:
+        """
+        Prepare a raw data dump for caching and further processing
+        """
 
-        else:
-            # Get data from Meteostat
-            df = load_handler(
-                self.endpoint,
-                file,
-                self.proxy,
-                self._columns,
-            )
+        # Validate and prepare data for further processing
+        if not df.empty:
+            # Add weather station ID
+            df["station"] = station
 
-            # Validate and prepare data for further processing
-            if not df.empty:
-                # Add weather station ID
-                df["station"] = station
+            # Set index
+            df = df.set_index(["station", "start", "end", "month"])
 
-                # Set index
-                df = df.set_index(["station", "start", "end", "month"])
+        return df
 
-            # Save as Pickle
-            if self.max_age > 0:
-                df.to_pickle(path)
+    def _filter_period(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Filter a processed data dump by period
+        """
 
         # Filter time period and append to DataFrame
         if self.granularity == Granularity.NORMALS and not df.empty and self._end:
@@ -148,16 +136,38 @@ class Normals(MeteoData):
         self._start = start
         self._end = end
 
+        # Remember geo point for spatial interpolation
+        if isinstance(loc, Point):
+            self._point = loc
+            self._point_stations = stations
+
+        # Data is retrieved by the asynchronous loader
+        if self._deferred:
+            return
+
         # Get data for all weather stations
         self._data = self._get_data()
 
+        # Process data
+        self._process_data()
+
+    def _process_data(self) -> None:
+        """
+        Complete the climate normals once all data is retrieved
+        """
+
         # Interpolate data
-        if isinstance(loc, Point):
-            self._resolve_point(loc.method, stations, loc.alt, loc.adapt_temp)
+        if self._point is not None:
+            self._resolve_point(
+                self._point.method,
+                self._point_stations,
+                self._point.alt,
+                self._point.adapt_temp,
+            )
 
         # Clear cache
         if self.max_age > 0 and self.autoclean:
-            self.clear_cache()
+            self.clear_cache(limit=self.autoclean_limit)
 
     def normalize(self):
         """
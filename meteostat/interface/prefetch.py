@@ -0,0 +1,103 @@
+"""
+Prefetch Function
+
+Warm the cache for a set of weather stations ahead of time
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+from typing import Callable, Iterable, Optional, Union
+import pandas as pd
+from meteostat.enumerations.granularity import Granularity
+from meteostat.interface.stations import Stations
+from meteostat.interface.hourly import Hourly
+from meteostat.interface.daily import Daily
+from meteostat.interface.monthly import Monthly
+
+# Time series classes by granularity
+SERIES = {
+    Granularity.HOURLY: Hourly,
+    Granularity.DAILY: Daily,
+    Granularity.MONTHLY: Monthly,
+}
+
+# Possible outcomes of a single file
+OUTCOMES = ("downloaded", "revalidated", "skipped", "missing", "failed")
+
+
+def prefetch(  # pylint: disable=too-many-arguments,too-many-locals
+    loc: Union[Stations, pd.DataFrame, list, str],
+    granularities: Iterable[Union[Granularity, str]] = ("hourly", "daily", "monthly"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    model: bool = True,
+    threads: int = 32,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Download and preprocess all data dumps of the given weather stations
+    into the cache
+
+    Files which are still fresh in the cache are skipped, so an interrupted
+    run can simply be repeated. The optional progress callback receives the
+    number of completed and total files. Returns the number of files per
+    outcome and the number of bytes written to the cache.
+    """
+
+    # Resolve weather stations
+    if isinstance(loc, Stations):
+        loc = loc.fetch()
+
+    # Period arguments
+    period = {
+        key: value
+        for key, value in (("start", start), ("end", end))
+        if value is not None
+    }
+
+    # Collect the data dumps of all granularities
+    tasks = []
+
+    for granularity in granularities:
+        granularity = Granularity(granularity)
+
+        if granularity not in SERIES:
+            raise ValueError(f"Cannot prefetch {granularity.value} data")
+
+        series = SERIES[granularity]
+
+        if series.max_age <= 0:
+            raise ValueError("Prefetching requires the cache to be enabled")
+
+        instance = series._init_deferred(  # pylint: disable=protected-access
+            loc, model=model, **period
+        )
+
+        tasks += [
+            (instance, dataset)
+            for dataset in instance._get_datasets()  # pylint: disable=protected-access
+        ]
+
+    # Final report
+    report = dict.fromkeys(OUTCOMES, 0)
+    report["files"] = len(tasks)
+    report["bytes"] = 0
+
+    def run(task: tuple) -> tuple:
+        instance, dataset = task
+        return instance._prefetch_file(*dataset)  # pylint: disable=protected-access
+
+    with ThreadPool(max(1, threads)) as pool:
+        for done, (outcome, size) in enumerate(pool.imap_unordered(run, tasks), 1):
+            report[outcome] += 1
+            report["bytes"] += size
+            if progress is not None:
+                progress(done, len(tasks))
+
+    return report
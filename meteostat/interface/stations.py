@@ -8,15 +8,63 @@ under the terms of the Creative Commons Attribution-NonCommercial
 The code is licensed under the MIT license.
 """
 
+import os
+import threading
+import time
 from copy import copy
 from datetime import datetime, timedelta
-from typing import Union
+from typing import Callable, Optional, Union
+import numpy as np
 import pandas as pd
-from meteostat.core.cache import get_local_file_path, file_in_cache
+from meteostat.core.cache import (
+    get_local_file_path,
+    file_in_cache,
+    lock_path,
+    promote_cache,
+    read_cache,
+    read_cache_meta,
+    touch_cache,
+    write_cache,
+)
 from meteostat.core.loader import load_handler
+from meteostat.core.intervals import IntervalIndex
+from meteostat.core.locking import FileLock
+from meteostat.core.spatial import SpatialIndex
+from meteostat.utilities.compact import compact_table, expand_column
+from meteostat.core.warn import warn
 from meteostat.interface.base import Base
 from meteostat.utilities.helpers import get_distance
 
+# Loaded lists of weather stations by endpoint and layout
+# Each entry holds the DataFrame, the public types of compacted columns,
+# its indexes and the modification time of its cache entry
+_tables: dict = {}
+
+# Locks for loading lists of weather stations by endpoint and layout
+_loading: dict = {}
+
+# Times of failed attempts to load lists of weather stations for their
+# inventory by endpoint and layout
+_failures: dict = {}
+
+# Lock for the loaded lists and their locks
+_tables_lock = threading.Lock()
+
+
+def _reset_tables() -> None:
+    """
+    Drop the inherited locks in a forked child process
+    """
+
+    global _tables_lock, _loading  # pylint: disable=global-statement
+
+    _tables_lock = threading.Lock()
+    _loading = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_tables)
+
 
 class Stations(Base):
     """
@@ -26,8 +74,34 @@ class Stations(Base):
     # The cache subdirectory
     cache_subdir: str = "stations"
 
-    # The list of selected weather Stations
-    _data: pd.DataFrame = None
+    # Keep the list of weather stations in a compact layout?
+    # This saves memory, but fetching stations takes a little longer
+    compact = False
+
+    # The file of the full list of weather stations
+    _file: str = "stations/slim.csv.gz"
+
+    # The full list of weather stations
+    _table: pd.DataFrame = None
+
+    # Public types of the compacted columns of the full list
+    _dtypes: dict = None
+
+    # Indexes of the full list of weather stations, built on first use
+    _indexes: dict = None
+
+    # Filters of the selection (methods returning a boolean mask over the
+    # full list and their arguments), which are applied lazily
+    _filters: tuple = ()
+
+    # Location (latitude, longitude, radius) the selection is sorted by
+    _location: Optional[tuple] = None
+
+    # Unit conversions of the selection
+    _units: tuple = ()
+
+    # The selected weather stations, once the query has run
+    _selection: Optional[pd.DataFrame] = None
 
     # Raw data columns
     _columns: list = [
@@ -66,107 +140,550 @@ class Stations(Base):
     # Columns for date parsing
     _parse_dates: list = [10, 11, 12, 13, 14, 15]
 
-    def _load(self) -> None:
+    def _download(self, path: str, file: str) -> pd.DataFrame:
+        """
+        Download the list of weather stations and save it to the cache
+        """
+
+        # Metadata of an expired cache entry
+        meta = read_cache_meta(path) if self.max_age > 0 else {}
+
+        # Get data from Meteostat
+        df = load_handler(
+            self.endpoint,
+            file,
+            self.proxy,
+            self._columns,
+            self._types,
+            self._parse_dates,
+            timeout=self.timeout,
+            pool_size=self.pool_size,
+            meta=meta,
+            memory_map=self.memory_map,
+        )
+
+        if df is None:
+            # Cached file was not modified
+            touch_cache(path)
+            df = read_cache(path, memory_map=self.memory_map)
+
+        else:
+            # Add index
+            df = df.set_index("id")
+
+            # Save to cache
+            if meta.get("status", 200) >= 400:
+                warn(f"Cannot load {file} from {self.endpoint}")
+            elif self.max_age > 0:
+                write_cache(
+                    path,
+                    df,
+                    meta,
+                    self.cache_format,
+                    self.max_age,
+                    self.cache_compression,
+                    self.cache_compression_level,
+                )
+
+        return df
+
+    def _read(self) -> tuple:
         """
-        Load file from Meteostat
+        Read the list of weather stations from the cache or Meteostat,
+        returning the DataFrame and the modification time of its cache entry
         """
 
         # File name
-        file = "stations/slim.csv.gz"
+        file = self._file
 
         # Get local file path
         path = get_local_file_path(self.cache_dir, self.cache_subdir, file)
 
-        # Check if file in cache
-        if self.max_age > 0 and file_in_cache(path, self.max_age):
+        # Check if file in cache, falling back to the shared cache
+        if self.max_age > 0 and (
+            file_in_cache(path, self.max_age)
+            or (
+                self.shared_cache_dir is not None
+                and promote_cache(
+                    get_local_file_path(self.shared_cache_dir, self.cache_subdir, file),
+                    path,
+                    self.max_age,
+                )
+                and file_in_cache(path, self.max_age)
+            )
+        ):
             # Read cached data
-            df = pd.read_pickle(path)
+            df = read_cache(path, memory_map=self.memory_map)
 
         else:
-            # Get data from Meteostat
-            df = load_handler(
-                self.endpoint,
-                file,
-                self.proxy,
-                self._columns,
-                self._types,
-                self._parse_dates,
-            )
+            # Only one process downloads the file at a time
+            with FileLock(lock_path(path) if self.max_age > 0 else None):
+                # The file might have been downloaded in the meantime
+                if self.max_age > 0 and file_in_cache(path, self.max_age):
+                    df = read_cache(path, memory_map=self.memory_map)
+                else:
+                    df = self._download(path, file)
+
+        # Cached files might restore columns with different types
+        df = df.astype(
+            {column: dtype for column, dtype in self._types.items() if column in df}
+        )
 
-            # Add index
-            df = df.set_index("id")
+        # The list expires with its cache entry
+        try:
+            mtime = os.path.getmtime(path) if self.max_age > 0 else time.time()
+        except OSError:
+            mtime = time.time()
+
+        return df, mtime
+
+    def _expired(self, entry: Optional[tuple]) -> bool:
+        """
+        Check if a loaded list of weather stations has expired
+        """
 
-            # Save as Pickle
-            if self.max_age > 0:
-                df.to_pickle(path)
+        return entry is None or time.time() - entry[3] >= self.max_age
+
+    def _load(self) -> None:
+        """
+        Get the list of weather stations, which is loaded once per process
+        and shared by all instances until it expires
+        """
+
+        key = (self.endpoint, self.compact)
+
+        with _tables_lock:
+            entry = _tables.get(key)
+            lock = _loading.setdefault(key, threading.Lock())
+
+        if self._expired(entry):
+            # Only one thread loads each list at a time
+            with lock:
+                # The list might have been loaded in the meantime
+                with _tables_lock:
+                    entry = _tables.get(key)
+
+                if self._expired(entry):
+                    df, mtime = self._read()
+                    entry = (*(compact_table(df) if self.compact else (df, {})), {})
+                    entry += (mtime,)
+
+                    # Don't share a list which couldn't be loaded
+                    if not df.empty:
+                        with _tables_lock:
+                            _tables[key] = entry
 
         # Set data
-        self._data = df
+        self._table, self._dtypes, self._indexes, _ = entry
 
     def __init__(self) -> None:
         # Get all weather stations
         self._load()
 
-    def nearby(self, lat: float, lon: float, radius: int = None) -> "Stations":
+    @classmethod
+    def _get_loaded(cls, download: bool = False) -> Optional["Stations"]:
         """
-        Sort/filter weather stations by physical distance
+        Get the full list of weather stations if it's loaded or cached
+
+        Otherwise, the list is only downloaded if requested. Failed attempts
+        aren't repeated until max_age has passed.
+        """
+
+        stations = cls.__new__(cls)
+        key = (cls.endpoint, cls.compact)
+
+        with _tables_lock:
+            loaded = not stations._expired(_tables.get(key))
+            failed = time.time() - _failures.get(key, -np.inf) < cls.max_age
+
+        if not (
+            loaded
+            or (
+                cls.max_age > 0
+                and file_in_cache(
+                    get_local_file_path(cls.cache_dir, cls.cache_subdir, cls._file),
+                    cls.max_age,
+                )
+            )
+            or (download and not failed)
+        ):
+            return None
+
+        try:
+            stations._load()
+        except OSError:
+            stations._table = None
+
+        # Remember lists which couldn't be loaded
+        if stations._table is None or stations._table.empty:
+            with _tables_lock:
+                _failures[key] = time.time()
+            return None
+
+        return stations
+
+    def _get_periods(self, ids: pd.Index, freq: str) -> pd.DataFrame:
+        """
+        Get the inventory periods of weather stations by ID, copying only
+        the rows of these stations
+        """
+
+        columns = [f"{freq}_start", f"{freq}_end"]
+        periods = self._table.loc[self._table.index.isin(ids), columns]
+        periods = periods[~periods.index.duplicated()]
+
+        for column in columns:
+            if column in self._dtypes:
+                periods[column] = expand_column(periods[column], self._dtypes[column])
+
+        return periods
+
+    def _column(self, column: str) -> pd.Series:
+        """
+        Get a column of the full list in its public layout
+        """
+
+        if column in self._dtypes:
+            return expand_column(self._table[column], self._dtypes[column])
+
+        return self._table[column]
+
+    def _get_spatial_index(self) -> SpatialIndex:
+        """
+        Get the spatial index of the full list of weather stations
+        """
+
+        if "spatial" not in self._indexes:
+            self._indexes["spatial"] = SpatialIndex(
+                self._column("latitude"), self._column("longitude")
+            )
+
+        return self._indexes["spatial"]
+
+    def _get_inventory_index(self, freq: str) -> IntervalIndex:
+        """
+        Get the index of the inventory periods of a granularity
+        """
+
+        if f"{freq}_inventory" not in self._indexes:
+            self._indexes[f"{freq}_inventory"] = IntervalIndex(
+                self._column(f"{freq}_start"), self._column(f"{freq}_end")
+            )
+
+        return self._indexes[f"{freq}_inventory"]
+
+    def _get_categorical_index(self, column: str) -> tuple:
+        """
+        Get the codes of a column's values (-1 if missing), the unique
+        values and the first position of each value in the full list
+        """
+
+        if column not in self._indexes:
+            codes, categories = pd.factorize(
+                self._table.index if column == "id" else self._table[column]
+            )
+
+            # First position of each value
+            first = np.full(len(categories), -1, dtype="int64")
+            positions = np.flatnonzero(codes >= 0)[::-1]
+            first[codes[positions]] = positions
+
+            self._indexes[column] = (codes, categories, first)
+
+        return self._indexes[column]
+
+    def _codes_mask(self, column: str, values: list) -> np.ndarray:
+        """
+        Get the stations with one of the values in a column
+        """
+
+        codes, categories, _ = self._get_categorical_index(column)
+        wanted = categories.get_indexer([str(value) for value in values])
+        wanted = wanted[wanted >= 0]
+
+        if len(wanted) == 1:
+            return codes == wanted[0]
+
+        return np.isin(codes, wanted)
+
+    def _derive(self) -> "Stations":
+        """
+        Create a new selection based on the current one
         """
 
-        # Create temporal instance
         temp = copy(self)
+        temp._selection = None
+
+        return temp
+
+    def _filter(self, method: Callable, *args) -> "Stations":
+        """
+        Add a filter to a new selection
+        """
+
+        temp = self._derive()
+        temp._filters = self._filters + ((method, args),)
+
+        return temp
+
+    def _get_mask(self) -> Optional[np.ndarray]:
+        """
+        Combine all filters into one boolean mask over the full list
+        (None if there are no filters)
+        """
+
+        mask = None
 
-        # Get distance for each station
-        temp._data["distance"] = get_distance(
-            lat, lon, temp._data["latitude"], temp._data["longitude"]
+        for method, args in self._filters:
+            result = method(self, *args)
+            mask = result if mask is None else mask & result
+
+        return mask
+
+    def _radius_mask(self, lat: float, lon: float, radius: int) -> np.ndarray:
+        """
+        Get the stations within a radius
+        """
+
+        mask = np.zeros(len(self._table.index), dtype=bool)
+        mask[self._get_spatial_index().query_radius(lat, lon, radius)[0]] = True
+
+        return mask
+
+    def _region_mask(self, country: str, state: Optional[str]) -> np.ndarray:
+        """
+        Get the stations in a country/region
+        """
+
+        mask = self._codes_mask("country", [country])
+
+        if state is not None:
+            mask &= self._codes_mask("region", [state])
+
+        return mask
+
+    def _bounds_mask(self, top_left: tuple, bottom_right: tuple) -> np.ndarray:
+        """
+        Get the stations within geographical bounds
+        """
+
+        lat, lon = self._column("latitude"), self._column("longitude")
+
+        return (
+            (lat <= top_left[0])
+            & (lat >= bottom_right[0])
+            & (lon <= bottom_right[1])
+            & (lon >= top_left[1])
+        ).to_numpy(dtype=bool, na_value=False)
+
+    def _inventory_mask(
+        self, freq: str, required: Union[datetime, tuple, bool], max_age: int
+    ) -> np.ndarray:
+        """
+        Get the stations with inventory data
+        """
+
+        # Make sure data exists at all
+        if required is True:
+            return self._column(f"{freq}_start").notna().to_numpy()
+
+        # Make sure data exists across period or on a certain day
+        first, last = required if isinstance(required, tuple) else (required,) * 2
+        positions = self._get_inventory_index(freq).query(
+            first, last - timedelta(seconds=max_age)
+        )
+
+        mask = np.zeros(len(self._table.index), dtype=bool)
+        mask[positions] = True
+
+        return mask
+
+    def _sort_by_distance(self, mask: Optional[np.ndarray]) -> tuple:
+        """
+        Sort the selected stations by their distance to the location
+        """
+
+        lat, lon, _ = self._location
+
+        if mask is None:
+            positions = np.arange(len(self._table.index))
+        else:
+            positions = np.flatnonzero(mask)
+
+        distances = get_distance(
+            lat,
+            lon,
+            self._column("latitude").to_numpy()[positions],
+            self._column("longitude").to_numpy()[positions],
         )
 
-        # Filter by radius
+        # Stations without coordinates come last
+        order = np.argsort(distances, kind="stable")
+
+        return positions[order], distances[order]
+
+    def _select(self, limit: Optional[int] = None) -> tuple:
+        """
+        Run the query, returning the positions of the selected stations in
+        the full list and their distances (None if not sorted by distance)
+        """
+
+        mask = self._get_mask()
+
+        if self._location is None:
+            if mask is None:
+                return np.arange(len(self._table.index))[:limit], None
+            return np.flatnonzero(mask)[:limit], None
+
+        lat, lon, radius = self._location
+        index = self._get_spatial_index()
+
         if radius:
-            temp._data = temp._data[temp._data["distance"] <= radius]
+            positions, distances = index.query_radius(lat, lon, radius, mask)
+        elif limit:
+            positions, distances = index.query_nearest(lat, lon, limit, mask=mask)
+            if len(positions) < limit:
+                positions, distances = self._sort_by_distance(mask)
+        else:
+            positions, distances = self._sort_by_distance(mask)
+
+        return positions[:limit], distances[:limit]
+
+    def _fetch(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get a DataFrame of the selected weather stations
+        """
+
+        positions, distances = self._select(limit)
+        df = self._table.iloc[positions]
+
+        # Restore compacted columns
+        if self._dtypes:
+            df = df.assign(
+                **{
+                    column: expand_column(df[column], dtype)
+                    for column, dtype in self._dtypes.items()
+                }
+            )
+
+        # Add distance
+        if distances is not None:
+            df = df.assign(distance=distances)
+
+        # Change data units
+        for units in self._units:
+            df = df.assign(
+                **{
+                    parameter: df[parameter].apply(unit)
+                    for parameter, unit in units.items()
+                    if parameter in df.columns.values
+                }
+            )
+
+        return df
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """
+        The selected weather stations
+        """
 
-        # Sort stations by distance
-        temp._data.columns.str.strip()
-        temp._data = temp._data.sort_values("distance")
+        if self._selection is None:
+            self._selection = self._fetch()
+
+        return self._selection
+
+    def nearby(self, lat: float, lon: float, radius: int = None) -> "Stations":
+        """
+        Sort/filter weather stations by physical distance
+        """
+
+        temp = self._derive()
+
+        # Keep the radius of a previous location
+        if self._location is not None and self._location[2]:
+            temp._filters = self._filters + ((Stations._radius_mask, self._location),)
+
+        temp._location = (lat, lon, radius)
 
-        # Return self
         return temp
 
+    def nearest(self, lat, lon, k: int = 1, radius: int = None) -> tuple:
+        """
+        Get the k nearest weather stations of many locations at once
+
+        Returns the stations' positions in the current selection (-1 if
+        there are fewer than k stations within radius) and their distances
+        in meters, with one row per location.
+        """
+
+        if not self._filters and self._location is None:
+            index = self._get_spatial_index()
+        else:
+            index = SpatialIndex(self._data["latitude"], self._data["longitude"])
+
+        return index.query_nearest_batch(lat, lon, k, radius)
+
     def region(self, country: str, state: str = None) -> "Stations":
         """
         Filter weather stations by country/region code
         """
 
-        # Create temporal instance
-        temp = copy(self)
+        return self._filter(Stations._region_mask, country, state)
 
-        # Country code
-        temp._data = temp._data[temp._data["country"] == country]
+    def wmo(self, codes: Union[str, list]) -> "Stations":
+        """
+        Filter weather stations by WMO code(s)
+        """
 
-        # State code
-        if state is not None:
-            temp._data = temp._data[temp._data["region"] == state]
+        return self._filter(
+            Stations._codes_mask, "wmo", [codes] if isinstance(codes, str) else codes
+        )
 
-        # Return self
-        return temp
+    def icao(self, codes: Union[str, list]) -> "Stations":
+        """
+        Filter weather stations by ICAO code(s)
+        """
 
-    def bounds(self, top_left: tuple, bottom_right: tuple) -> "Stations":
+        return self._filter(
+            Stations._codes_mask, "icao", [codes] if isinstance(codes, str) else codes
+        )
+
+    def lookup(self, column: str, values: list) -> pd.Series:
         """
-        Filter weather stations by geographical bounds
+        Map WMO or ICAO codes (or station IDs) to the ID of the first
+        matching weather station in the current selection
+
+        Returns a Series of station IDs indexed by the given values,
+        which is <NA> if there is no match.
         """
 
-        # Create temporal instance
-        temp = copy(self)
+        if column not in ("id", "wmo", "icao"):
+            raise ValueError(f"Cannot look up weather stations by {column}")
 
-        # Return stations in boundaries
-        temp._data = temp._data[
-            (temp._data["latitude"] <= top_left[0])
-            & (temp._data["latitude"] >= bottom_right[0])
-            & (temp._data["longitude"] <= bottom_right[1])
-            & (temp._data["longitude"] >= top_left[1])
-        ]
+        # Positions of the first match in the full list
+        _, categories, first = self._get_categorical_index(column)
+        codes = categories.get_indexer([str(value) for value in values])
+        positions = np.where(codes >= 0, first[codes], -1)
 
-        # Return self
-        return temp
+        # Restrict to the current selection
+        mask = self._get_mask()
+        if self._location is not None and self._location[2]:
+            radius = self._radius_mask(*self._location)
+            mask = radius if mask is None else mask & radius
+        if mask is not None:
+            positions[~mask[positions]] = -1
+
+        ids = self._table.index.take(np.maximum(positions, 0)).astype("string")
+
+        return pd.Series(ids, index=values, dtype="string").where(positions >= 0)
+
+    def bounds(self, top_left: tuple, bottom_right: tuple) -> "Stations":
+        """
+        Filter weather stations by geographical bounds
+        """
+
+        return self._filter(Stations._bounds_mask, top_left, bottom_right)
 
     def inventory(
         self, freq: str, required: Union[datetime, tuple, bool] = True
@@ -175,51 +692,38 @@ class Stations(Base):
         Filter weather stations by inventory data
         """
 
-        # Create temporal instance
-        temp = copy(self)
+        return self._filter(Stations._inventory_mask, freq, required, self.max_age)
 
-        if required is True:
-            # Make sure data exists at all
-            temp._data = temp._data[~pd.isna(temp._data[f"{freq}_start"])]
-
-        elif isinstance(required, tuple):
-            # Make sure data exists across period
-            temp._data = temp._data[
-                (~pd.isna(temp._data[f"{freq}_start"]))
-                & (temp._data[freq + "_start"] <= required[0])
-                & (
-                    temp._data[freq + "_end"] + timedelta(seconds=temp.max_age)
-                    >= required[1]
-                )
-            ]
+    def inventory_counts(self, freq: str, periods: list) -> np.ndarray:
+        """
+        Count the weather stations in the current selection with inventory
+        data for each of many periods (datetimes or (start, end) tuples)
+        """
+
+        periods = [
+            period if isinstance(period, tuple) else (period, period)
+            for period in periods
+        ]
+        first = [period[0] for period in periods]
+        last = [period[1] - timedelta(seconds=self.max_age) for period in periods]
 
+        if not self._filters and (self._location is None or not self._location[2]):
+            index = self._get_inventory_index(freq)
         else:
-            # Make sure data exists on a certain day
-            temp._data = temp._data[
-                (~pd.isna(temp._data[f"{freq}_start"]))
-                & (temp._data[freq + "_start"] <= required)
-                & (
-                    temp._data[freq + "_end"] + timedelta(seconds=temp.max_age)
-                    >= required
-                )
-            ]
+            index = IntervalIndex(
+                self._data[f"{freq}_start"], self._data[f"{freq}_end"]
+            )
 
-        return temp
+        return index.count(first, last)
 
     def convert(self, units: dict) -> "Stations":
         """
         Convert columns to a different unit
         """
 
-        # Create temporal instance
-        temp = copy(self)
-
-        # Change data units
-        for parameter, unit in units.items():
-            if parameter in temp._data.columns.values:
-                temp._data[parameter] = temp._data[parameter].apply(unit)
+        temp = self._derive()
+        temp._units = self._units + (units,)
 
-        # Return class instance
         return temp
 
     def count(self) -> int:
@@ -227,26 +731,33 @@ class Stations(Base):
         Return number of weather stations in current selection
         """
 
-        return len(self._data.index)
+        if self._selection is not None:
+            return len(self._selection.index)
+
+        # Sorting doesn't change the number of stations
+        if self._location is None or not self._location[2]:
+            mask = self._get_mask()
+            return len(self._table.index) if mask is None else int(mask.sum())
+
+        return len(self._select()[0])
 
     def fetch(self, limit: int = None, sample: bool = False) -> pd.DataFrame:
         """
         Fetch all weather stations or a (sampled) subset
         """
 
-        # Copy DataFrame
-        temp = copy(self._data)
-
         # Return limited number of sampled entries
         if sample and limit:
-            return temp.sample(limit)
+            return self._data.sample(limit)
 
         # Return limited number of entries
         if limit:
-            return temp.head(limit)
+            if self._selection is None:
+                return self._fetch(limit)
+            return self._selection.head(limit).copy()
 
         # Return all entries
-        return temp
+        return self._data.copy()
 
     # Import additional methods
     from meteostat.core.cache import clear_cache
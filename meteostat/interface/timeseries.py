@@ -8,21 +8,19 @@ under the terms of the Creative Commons Attribution-NonCommercial
 The code is licensed under the MIT license.
 """
 
-from datetime import datetime
-from typing import Optional, Union
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
 import pandas as pd
-from meteostat.core.cache import file_in_cache, get_local_file_path
-from meteostat.core.loader import load_handler
 from meteostat.enumerations.granularity import Granularity
-from meteostat.utilities.endpoint import generate_endpoint_path
 from meteostat.utilities.mutations import filter_time, localize
 from meteostat.utilities.validations import validate_series
 from meteostat.utilities.helpers import get_flag_from_source_factory, with_suffix
 from meteostat.interface.point import Point
+from meteostat.interface.stations import Stations
 from meteostat.interface.meteodata import MeteoData
 
 
-class TimeSeries(MeteoData):
+class TimeSeries(MeteoData):  # pylint: disable=too-many-instance-attributes
     """
     TimeSeries class which provides features which are
     used across all time series classes
@@ -31,6 +29,10 @@ class TimeSeries(MeteoData):
     # Base URL of the Meteostat bulk data interface
     endpoint = "https://data.meteostat.net/"
 
+    # Download the list of weather stations for the inventory of stations
+    # which are passed by ID? Otherwise, it's only used if loaded or cached
+    inventory_download = False
+
     # The list of origin weather Stations
     _origin_stations: Optional[pd.Index] = None
 
@@ -46,84 +48,68 @@ class TimeSeries(MeteoData):
     # Fetch source flags?
     _flags = False
 
-    def _load_data(self, station: str, year: Optional[int] = None) -> None:
+    # Inventory periods of the weather stations
+    _inventory: Optional[pd.DataFrame] = None
+
+    def _process_file(self, df: pd.DataFrame, station: str) -> pd.DataFrame:
         """
-        Load file for a single station from Meteostat
+        Prepare a raw data dump for caching and further processing
         """
-        # File name
-        file = generate_endpoint_path(self.granularity, station, year)
-
-        # Get local file path
-        path = get_local_file_path(self.cache_dir, self.cache_subdir, file)
-
-        # Check if file in cache
-        if self.max_age > 0 and file_in_cache(path, self.max_age):
-            # Read cached data
-            df = pd.read_pickle(path)
-
-        else:
-            # Get data from Meteostat
-            df = load_handler(
-                self.endpoint,
-                file,
-                self.proxy,
-                default_df=pd.DataFrame(
-                    columns=self._raw_columns
-                    + with_suffix(self._raw_columns, "_source")
-                ),
-            )
 
-            # Add time column and drop original columns
-            if len(self._parse_dates) < 3:
-                df["day"] = 1
-
-            df["time"] = pd.to_datetime(
-                df[
-                    (
-                        self._parse_dates
-                        if len(self._parse_dates) > 2
-                        else self._parse_dates + ["day"]
-                    )
-                ]
-            )
-            df = df.drop(self._parse_dates, axis=1)
-
-            # Validate and prepare data for further processing
-            df = validate_series(df, station)
-
-            # Rename columns
-            df = df.rename(columns=self._renamed_columns, errors="ignore")
-
-            # Convert sources to flags
-            for col in df.columns:
-                basecol = col[:-7] if col.endswith("_source") else col
-
-                if basecol not in self._processed_columns:
-                    df.drop(col, axis=1, inplace=True)
-                    continue
-
-                if basecol == col:
-                    df[col] = df[col].astype("Float64")
-
-                if col.endswith("_source"):
-                    flagcol = f"{basecol}_flag"
-                    df[flagcol] = pd.NA
-                    df[flagcol] = df[flagcol].astype("string")
-                    mask = df[col].notna()
-                    df.loc[mask, flagcol] = df.loc[mask, col].apply(
-                        get_flag_from_source_factory(
-                            self._source_mappings, self._model_flag
-                        )
+        # Add time column and drop original columns
+        if len(self._parse_dates) < 3:
+            df["day"] = 1
+
+        df["time"] = pd.to_datetime(
+            df[
+                (
+                    self._parse_dates
+                    if len(self._parse_dates) > 2
+                    else self._parse_dates + ["day"]
+                )
+            ]
+        )
+        df = df.drop(self._parse_dates, axis=1)
+
+        # Validate and prepare data for further processing
+        df = validate_series(df, station)
+
+        # Rename columns
+        df = df.rename(columns=self._renamed_columns, errors="ignore")
+
+        # Convert sources to flags
+        for col in df.columns:
+            basecol = col[:-7] if col.endswith("_source") else col
+
+            if basecol not in self._processed_columns:
+                df.drop(col, axis=1, inplace=True)
+                continue
+
+            if basecol == col:
+                df[col] = df[col].astype("Float64")
+
+            if col.endswith("_source"):
+                flagcol = f"{basecol}_flag"
+                df[flagcol] = pd.NA
+                df[flagcol] = df[flagcol].astype("string")
+                mask = df[col].notna()
+                df.loc[mask, flagcol] = df.loc[mask, col].apply(
+                    get_flag_from_source_factory(
+                        self._source_mappings, self._model_flag
                     )
-                    df.drop(col, axis=1, inplace=True)
+                )
+                df.drop(col, axis=1, inplace=True)
 
-            # Process virtual columns
-            for key, value in self._virtual_columns.items():
-                df = value(df, key)
+        # Process virtual columns
+        for key, value in self._virtual_columns.items():
+            df = value(df, key)
 
-            # Save as Pickle
-            if self.max_age > 0:
-                df.to_pickle(path)
+        return df
+
+    def _filter_period(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Localize and filter a processed data dump
+        """
 
         # Localize time column
         if (
@@ -134,10 +120,83 @@ class TimeSeries(MeteoData):
             df = localize(df, self._timezone)
 
         # Filter time period and append to DataFrame
-        df = filter_time(df, self._start, self._end)
+        return filter_time(df, self._start, self._end)
 
-        # Return
-        return df
+    @property
+    def _cache_columns(self) -> Optional[List[str]]:
+        """
+        Get the list of columns which are read from the cache
+
+        Flags are only needed if requested or for removing model data.
+        """
+
+        if self._flags or not self._model:
+            return None
+
+        return self._processed_columns
+
+    @property
+    def _default_df(self) -> pd.DataFrame:
+        """
+        Get an empty raw data dump
+        """
+
+        return pd.DataFrame(
+            columns=self._raw_columns + with_suffix(self._raw_columns, "_source")
+        )
+
+    def _get_inventory(
+        self, stations: Optional[pd.DataFrame] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get the inventory periods of all weather stations
+        """
+
+        columns = [f"{self.granularity.value}_start", f"{self.granularity.value}_end"]
+
+        # Inventory provided along with the weather stations
+        if stations is not None and set(columns).issubset(stations.columns):
+            inventory = stations.loc[stations.index.isin(self._stations), columns]
+            return inventory[~inventory.index.duplicated()]
+
+        # Inventory of the shared list of weather stations
+        full = Stations._get_loaded(self.inventory_download)
+
+        if full is None:
+            return None
+
+        return full._get_periods(self._stations, self.granularity.value)
+
+    def _get_annual_steps(self, station: str) -> list:
+        """
+        Get the years for which a weather station might provide data
+        """
+
+        if self._inventory is None or station not in self._inventory.index:
+            return self._annual_steps
+
+        start, end = self._inventory.loc[station]
+
+        # Model data might be available for recent years only
+        recent = (datetime.now() - timedelta(days=180)).year
+
+        if pd.isna(start):
+            return [
+                year for year in self._annual_steps if self._model and year >= recent
+            ]
+
+        # Without model data, there is nothing after the end of the inventory
+        last = (
+            (end + timedelta(seconds=self.max_age)).year
+            if not (self._model or pd.isna(end))
+            else None
+        )
+
+        return [
+            year
+            for year in self._annual_steps
+            if year >= start.year and (last is None or year <= last)
+        ]
 
     def _filter_model(self) -> None:
         """
@@ -186,9 +245,35 @@ class TimeSeries(MeteoData):
         self._model = model
         self._flags = flags
 
+        # Remember geo point for spatial interpolation
+        if isinstance(loc, Point):
+            self._point = loc
+            self._point_stations = stations
+
+        # Skip years which are not covered by the stations' inventory
+        if (
+            self.granularity in (Granularity.HOURLY, Granularity.DAILY)
+            and len(self._stations) > 0
+        ):
+            self._inventory = self._get_inventory(
+                loc if isinstance(loc, pd.DataFrame) else self._point_stations
+            )
+
+        # Data is retrieved by the asynchronous loader
+        if self._deferred:
+            return
+
         # Get data for all weather stations
         self._data = self._get_data()
 
+        # Process data
+        self._process_data()
+
+    def _process_data(self) -> None:
+        """
+        Complete the time series once all data is retrieved
+        """
+
         # Fill columns if they don't exist
         for col in self._processed_columns:
             if col not in self._data.columns:
@@ -204,7 +289,7 @@ class TimeSeries(MeteoData):
         ]
 
         # Remove model data from DataFrame
-        if not model:
+        if not self._model:
             self._filter_model()
 
         # Conditionally, remove flags from DataFrame
@@ -218,12 +303,17 @@ class TimeSeries(MeteoData):
 
         # Interpolate data spatially if requested
         # location is a geographical point
-        if isinstance(loc, Point):
-            self._resolve_point(loc.method, stations, loc.alt, loc.adapt_temp)
+        if self._point is not None:
+            self._resolve_point(
+                self._point.method,
+                self._point_stations,
+                self._point.alt,
+                self._point.adapt_temp,
+            )
 
         # Clear cache if auto cleaning is enabled
         if self.max_age > 0 and self.autoclean:
-            self.clear_cache()
+            self.clear_cache(limit=self.autoclean_limit)
 
     # Import methods
     from meteostat.series.normalize import normalize
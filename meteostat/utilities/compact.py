@@ -0,0 +1,102 @@
+"""
+Utilities - Compact DataFrames
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+
+# Columns which are stored as categoricals
+CATEGORICAL_COLUMNS = ("country", "region", "timezone")
+
+# Columns which are stored as 32-bit floats
+FLOAT_COLUMNS = ("latitude", "longitude")
+
+# Columns of strings which are interned
+INTERNED_COLUMNS = ("name",)
+
+# Number of decimals of 32-bit floats
+FLOAT_DECIMALS = 4
+
+# Day offset of missing dates
+MISSING_DAY = np.iinfo("int32").min
+
+
+def compact_column(column: pd.Series) -> pd.Series:
+    """
+    Convert a column to its compact layout
+    """
+
+    # Dates as days since the epoch
+    if pd.api.types.is_datetime64_dtype(column.dtype):
+        days = column.to_numpy().astype("datetime64[D]").astype("int64")
+        days[pd.isna(column).to_numpy()] = MISSING_DAY
+        return pd.Series(days.astype("int32"), index=column.index, name=column.name)
+
+    if column.name in CATEGORICAL_COLUMNS:
+        return column.astype("category")
+
+    if column.name in FLOAT_COLUMNS:
+        return column.astype("float32")
+
+    return column
+
+
+def expand_column(column: pd.Series, dtype) -> pd.Series:
+    """
+    Convert a compact column back to its original type
+    """
+
+    if column.dtype == "int32":
+        days = column.to_numpy()
+        dates = days.astype("int64").astype("datetime64[D]")
+        dates[days == MISSING_DAY] = np.datetime64("NaT")
+        return pd.Series(dates, index=column.index, name=column.name).astype(dtype)
+
+    if column.dtype == "float32":
+        return column.astype("float64").round(FLOAT_DECIMALS).astype(dtype)
+
+    return column.astype(dtype)
+
+
+def compact_table(df: pd.DataFrame) -> tuple:
+    """
+    Convert a DataFrame to a compact layout, returning the DataFrame and
+    the original types of all converted columns
+
+    Columns are only converted if they can be restored without changes.
+    """
+
+    df = df.copy()
+    dtypes = {}
+
+    for name in df.columns:
+        column = df[name]
+
+        # Share equal strings
+        if name in INTERNED_COLUMNS and column.dtype == object:
+            df[name] = pd.Series(
+                [
+                    sys.intern(value) if isinstance(value, str) else value
+                    for value in column
+                ],
+                index=column.index,
+                dtype=object,
+            )
+            continue
+
+        compact = compact_column(column)
+
+        if compact is not column and expand_column(compact, column.dtype).equals(
+            column
+        ):
+            df[name] = compact
+            dtypes[name] = column.dtype
+
+    return df, dtypes
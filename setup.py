@@ -27,6 +27,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=["pandas>=2", "pytz", "numpy"],
+    extras_require={"arrow": ["pyarrow"]},
     license="MIT",
     classifiers=[
         "Programming Language :: Python :: 3",
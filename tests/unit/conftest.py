@@ -0,0 +1,86 @@
+"""
+Unit Test Fixtures
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+
+class BulkServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Meteostat bulk data interface
+    """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), BulkHandler)
+        self.files = {}
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        """
+        The endpoint URL
+        """
+
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class BulkHandler(BaseHTTPRequestHandler):
+    """
+    Serve (gzipped) files with ETag validation
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Handle GET request
+        """
+
+        body = self.server.files.get(self.path.lstrip("/"))
+
+        if body is None:
+            status = 404
+        else:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            status = 304 if self.headers.get("If-None-Match") == etag else 200
+
+        self.server.requests.append((self.path.lstrip("/"), status))
+        self.send_response(status)
+
+        if status == 200:
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            if status == 304:
+                self.send_header("ETag", etag)
+            else:
+                self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(name="bulk_server")
+def fixture_bulk_server():
+    """
+    Run a local bulk data server
+    """
+
+    httpd = BulkServer()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
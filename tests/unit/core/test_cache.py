@@ -8,7 +8,10 @@ under the terms of the Creative Commons Attribution-NonCommercial
 The code is licensed under the MIT license.
 """
 
-from meteostat.core.cache import get_local_file_path
+import os
+import pandas as pd
+import pytest
+from meteostat.core.cache import get_local_file_path, read_cache, write_cache
 
 
 EXPECTED_FILE_PATH = "cache/hourly/6dfc35c47756e962ef055d1049f1f8ec"
@@ -28,3 +31,67 @@ def test_get_local_file_path_chunked():
     """
 
     assert get_local_file_path("cache", "hourly", "10101_2022") != EXPECTED_FILE_PATH
+
+
+def get_frame() -> pd.DataFrame:
+    """
+    Create a processed DataFrame
+    """
+
+    return pd.DataFrame(
+        {
+            "station": ["10637", "10637"],
+            "time": pd.to_datetime(["2020-01-01", "2020-01-02"]),
+            "temp": pd.array([1.5, None], dtype="Float64"),
+            "temp_flag": pd.array(["A", None], dtype="string"),
+        }
+    ).set_index(["station", "time"])
+
+
+def test_feather_cache(tmp_path):
+    """
+    Test Feather cache files and column projection
+    """
+
+    pytest.importorskip("pyarrow")
+
+    df = get_frame()
+    path = str(tmp_path / "file")
+    write_cache(path, df)
+
+    with open(path, "rb") as file:
+        assert file.read(6) == b"ARROW1"
+
+    assert read_cache(path).equals(df)
+    assert read_cache(path, ["temp"]).equals(df[["temp"]])
+    assert read_cache(path, ["temp"], memory_map=True).equals(df[["temp"]])
+
+
+@pytest.mark.parametrize("codec", ["lz4", "zstd"])
+def test_compressed_feather_cache(tmp_path, codec):
+    """
+    Test compressed Feather cache files
+    """
+
+    pytest.importorskip("pyarrow")
+
+    df = pd.concat([get_frame()] * 1000)
+    path, compressed = str(tmp_path / "file"), str(tmp_path / "compressed")
+    write_cache(path, df)
+    write_cache(compressed, df, compression=codec, compression_level=3)
+
+    assert os.path.getsize(compressed) < os.path.getsize(path)
+    assert read_cache(compressed).equals(df)
+
+
+def test_pickle_cache(tmp_path):
+    """
+    Test pickled cache files
+    """
+
+    df = get_frame()
+    path = str(tmp_path / "file")
+    write_cache(path, df, fmt="pickle")
+
+    assert read_cache(path).equals(df)
+    assert read_cache(path, ["temp"]).equals(df[["temp"]])
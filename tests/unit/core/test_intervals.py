@@ -0,0 +1,47 @@
+"""
+Interval Index Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import numpy as np
+import pandas as pd
+from meteostat.core.intervals import IntervalIndex
+
+# Random intervals, including some without start or end
+rng = np.random.default_rng(0)
+START = pd.Series(pd.to_datetime(rng.integers(0, 20000, 2000), unit="D"))
+END = START + pd.to_timedelta(rng.integers(0, 10000, 2000), unit="D")
+START[::50] = pd.NaT
+END[::70] = pd.NaT
+
+# Random periods
+FIRST = pd.to_datetime(rng.integers(0, 30000, 500), unit="D")
+LAST = FIRST + pd.to_timedelta(rng.integers(0, 3000, 500), unit="D")
+
+
+def test_query():
+    """
+    Test: queries match a full scan
+    """
+
+    index = IntervalIndex(START, END)
+
+    for first, last in zip(FIRST[:50], LAST[:50]):
+        expected = np.flatnonzero(((START <= first) & (END >= last)).to_numpy())
+        assert sorted(index.query(first, last)) == list(expected)
+
+
+def test_count():
+    """
+    Test: batch counts match a full scan
+    """
+
+    expected = [((START <= a) & (END >= b)).sum() for a, b in zip(FIRST, LAST)]
+
+    assert list(IntervalIndex(START, END).count(FIRST, LAST)) == expected
+    assert list(IntervalIndex([], []).count(FIRST, LAST)) == [0] * 500
@@ -0,0 +1,138 @@
+"""
+Loader Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+import gzip
+import threading
+import tracemalloc
+from io import BytesIO
+from meteostat.core.loader import (
+    ChunkStream,
+    async_load_handler,
+    load_handler,
+    read_handler,
+)
+from meteostat.core.transport import AsyncSession
+
+CSV = b"year,month,temp\n" + b"".join(
+    f"2020,{month},{month / 2}\n".encode() for month in range(1, 13)
+)
+
+
+def test_read_handler_stream():
+    """
+    Test reading a gzipped CSV stream which is received in chunks
+    """
+
+    content = gzip.compress(CSV)
+    stream = ChunkStream()
+
+    def receive():
+        for start in range(0, len(content), 7):
+            stream.put(content[start : start + 7])
+        stream.put(None)
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+    df = read_handler(stream)
+    thread.join()
+
+    assert df.equals(read_handler(BytesIO(content)))
+    assert len(df.index) == 12
+
+
+def test_read_handler_empty():
+    """
+    Test reading an empty file
+    """
+
+    df = read_handler(BytesIO(gzip.compress(b"")), names=["a", "b"])
+
+    assert df.empty
+    assert list(df.columns) == ["a", "b"]
+
+
+def test_load_handler_revalidation(bulk_server):
+    """
+    Test conditional requests with ETag validators
+    """
+
+    bulk_server.files["daily/2020/10637.csv.gz"] = gzip.compress(CSV)
+
+    meta = {}
+    df = load_handler(bulk_server.url, "daily/2020/10637.csv.gz", timeout=5, meta=meta)
+
+    assert len(df.index) == 12
+    assert meta["etag"]
+
+    # Unchanged file
+    assert (
+        load_handler(
+            bulk_server.url,
+            "daily/2020/10637.csv.gz",
+            timeout=5,
+            meta=meta,
+        )
+        is None
+    )
+    assert bulk_server.requests[-1] == ("daily/2020/10637.csv.gz", 304)
+
+
+def test_async_load_handler(bulk_server):
+    """
+    Test streaming a file from the asynchronous session into the parser
+    """
+
+    rows = b"".join(f"2020,{i % 12 + 1},{i / 2}\n".encode() for i in range(100000))
+    bulk_server.files["daily/2020/10637.csv.gz"] = gzip.compress(rows)
+    names = ["year", "month", "temp"]
+
+    async def run():
+        async with AsyncSession(timeout=5) as session:
+            meta = {}
+            df = await async_load_handler(
+                session, bulk_server.url, "daily/2020/10637.csv.gz", names, meta=meta
+            )
+            unchanged = await async_load_handler(
+                session, bulk_server.url, "daily/2020/10637.csv.gz", names, meta=meta
+            )
+            return df, unchanged
+
+    df, unchanged = asyncio.run(run())
+
+    assert df.equals(
+        load_handler(bulk_server.url, "daily/2020/10637.csv.gz", names=names)
+    )
+    assert len(df.index) == 100000
+    assert unchanged is None
+
+
+def test_read_handler_memory():
+    """
+    Test the peak memory usage of reading a file
+    """
+
+    rows = b"".join(
+        f"2020,{i % 12 + 1},{i / 2},{i / 3},{i / 4},{i / 5}\n".encode()
+        for i in range(100000)
+    )
+    content = gzip.compress(rows)
+    names = ["year", "month", "a", "b", "c", "d"]
+
+    stream = BytesIO(content)
+    tracemalloc.start()
+    try:
+        df = read_handler(stream, names)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Little more than the DataFrame itself
+    assert peak < 2 * df.memory_usage(deep=True).sum()
@@ -0,0 +1,63 @@
+"""
+File Locking Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+from meteostat.core.locking import FileLock, async_file_lock
+
+
+def test_lock_is_exclusive(tmp_path):
+    """
+    Test: a lock can only be held once
+    """
+
+    path = str(tmp_path / "file.lock")
+
+    with FileLock(path):
+        assert not FileLock(path).acquire(blocking=False)
+
+    lock = FileLock(path)
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_async_lock_waits(tmp_path):
+    """
+    Test: the asynchronous lock waits for the lock to be released
+    """
+
+    path = str(tmp_path / "file.lock")
+    events = []
+
+    async def hold():
+        async with async_file_lock(path):
+            events.append("acquired")
+            await asyncio.sleep(0.2)
+            events.append("released")
+
+    async def wait():
+        await asyncio.sleep(0.05)
+        async with async_file_lock(path):
+            events.append("waited")
+
+    async def run():
+        await asyncio.gather(hold(), wait())
+
+    asyncio.run(run())
+
+    assert events == ["acquired", "released", "waited"]
+
+
+def test_lock_without_path():
+    """
+    Test: a lock without path doesn't lock anything
+    """
+
+    with FileLock(None):
+        assert FileLock(None).acquire(blocking=False)
@@ -0,0 +1,177 @@
+"""
+Cache Manifest Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import os
+import sqlite3
+import time
+import pandas as pd
+import pytest
+from meteostat import Base
+from meteostat.core import manifest
+from meteostat.core.cache import (
+    clear_cache,
+    lock_path,
+    read_cache,
+    write_cache,
+    write_cache_missing,
+)
+from meteostat.core.locking import FileLock
+from meteostat.core.manifest import MANIFEST_FILE, manifest_flush
+
+
+class Cache(Base):
+    """
+    A cache subdirectory
+    """
+
+    cache_subdir = "test"
+
+    clear_cache = clear_cache
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path, monkeypatch):
+    """
+    Use a temporary cache directory
+    """
+
+    monkeypatch.setattr(Cache, "cache_dir", str(tmp_path))
+    os.makedirs(tmp_path / "test")
+
+    return tmp_path / "test"
+
+
+def test_clear_expired_entries(cache):
+    """
+    Test: expired entries are removed without touching others
+    """
+
+    df = pd.DataFrame({"a": [1]})
+    write_cache(str(cache / "fresh"), df, ttl=60)
+    write_cache(str(cache / "expired"), df, ttl=-1)
+    write_cache(str(cache / "revalidate"), df, {"etag": '"1"'}, ttl=-1)
+    write_cache_missing(str(cache / "missing"), -1)
+
+    Cache.clear_cache()
+
+    assert sorted(os.listdir(cache)) == ["fresh", "revalidate", "revalidate.meta"]
+
+    Cache.clear_cache(0)
+
+    assert not os.listdir(cache)
+
+
+def test_clear_cache_in_batches(cache):
+    """
+    Test: the number of removed entries can be limited
+    """
+
+    for i in range(5):
+        write_cache(str(cache / str(i)), pd.DataFrame({"a": [i]}), ttl=-1)
+
+    Cache.clear_cache(limit=2)
+
+    assert len(os.listdir(cache)) == 3
+
+
+def test_index_existing_files(cache):
+    """
+    Test: files which were cached without a manifest are indexed once
+    """
+
+    expired = time.time() - 2 * Cache.max_age
+
+    for file in ("old", "new"):
+        pd.DataFrame({"a": [1]}).to_pickle(cache / file)
+    os.utime(cache / "old", (expired, expired))
+
+    Cache.clear_cache()
+
+    assert os.listdir(cache) == ["new"]
+
+
+def test_keep_lock_files(cache):
+    """
+    Test: lock files are kept, so held locks stay effective
+    """
+
+    path = str(cache / "expired")
+    write_cache(path, pd.DataFrame({"a": [1]}), ttl=-1)
+
+    lock = FileLock(lock_path(path))
+    assert lock.acquire()
+
+    try:
+        Cache.clear_cache()
+
+        assert os.listdir(cache) == ["expired.lock"]
+        assert not FileLock(lock_path(path)).acquire(blocking=False)
+    finally:
+        lock.release()
+
+
+def test_evict_least_recently_used(cache, monkeypatch):
+    """
+    Test: the least recently used entries are evicted to fit the size limit
+    """
+
+    for file in ("a", "b", "c"):
+        write_cache(str(cache / file), pd.DataFrame({"a": range(100)}), ttl=60)
+        time.sleep(0.01)
+
+    # Read the oldest entry
+    read_cache(str(cache / "a"))
+
+    size = os.path.getsize(cache / "a")
+    monkeypatch.setattr(Cache, "max_cache_size", 2 * size)
+    Cache.clear_cache()
+
+    assert sorted(os.listdir(cache)) == ["a", "c"]
+
+    monkeypatch.setattr(Cache, "max_cache_size", None)
+    monkeypatch.setattr(Cache, "max_total_cache_size", size)
+    Cache.clear_cache()
+
+    assert os.listdir(cache) == ["a"]
+
+
+def test_evict_after_removing_expired_entries(cache, monkeypatch):
+    """
+    Test: expired entries are deleted when size limits are set
+    """
+
+    for file in ("a", "b", "c"):
+        write_cache(str(cache / file), pd.DataFrame({"a": [1]}), ttl=60)
+    write_cache(str(cache / "b"), pd.DataFrame({"a": [1]}), ttl=-1)
+
+    monkeypatch.setattr(Cache, "max_cache_size", 10**9)
+    Cache.clear_cache()
+
+    assert sorted(os.listdir(cache)) == ["a", "c"]
+
+
+def test_buffered_access_times(cache, monkeypatch):
+    """
+    Test: access times are written in batches
+    """
+
+    write_cache(str(cache / "a"), pd.DataFrame({"a": [1]}), ttl=60)
+    conn = sqlite3.connect(cache.parent / MANIFEST_FILE)
+    written = conn.execute("SELECT atime FROM entries").fetchone()[0]
+
+    monkeypatch.setattr(manifest, "_flushed", time.time())
+    time.sleep(0.01)
+    read_cache(str(cache / "a"))
+
+    assert conn.execute("SELECT atime FROM entries").fetchone()[0] == written
+
+    manifest_flush()
+
+    assert conn.execute("SELECT atime FROM entries").fetchone()[0] > written
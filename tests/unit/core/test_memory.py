@@ -0,0 +1,56 @@
+"""
+Memory Cache Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import time
+import pandas as pd
+from meteostat.core.memory import MemoryCache
+
+
+def get_frame(value: int) -> pd.DataFrame:
+    """
+    Create a small DataFrame
+    """
+
+    return pd.DataFrame({"a": [value] * 10})
+
+
+def test_lru_eviction():
+    """
+    Test: least recently used entries are evicted first
+    """
+
+    size = int(get_frame(0).memory_usage(index=True, deep=True).sum())
+    cache = MemoryCache(2 * size)
+
+    cache.put("a", get_frame(1))
+    cache.put("b", get_frame(2))
+    cache.get("a")
+    cache.put("c", get_frame(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a")["a"].iloc[0] == 1
+    assert cache.stats() == {"entries": 2, "size": 2 * size, "hits": 2, "misses": 1}
+
+
+def test_expiry_and_copies():
+    """
+    Test: expired entries are dropped and hits are copies
+    """
+
+    cache = MemoryCache(10**6)
+    cache.put("old", get_frame(1), timestamp=time.time() - 100)
+    cache.put("new", get_frame(2))
+
+    assert cache.get("old", max_age=10) is None
+
+    df = cache.get("new", max_age=10)
+    df["a"] = 0
+
+    assert cache.get("new")["a"].iloc[0] == 2
@@ -0,0 +1,84 @@
+"""
+Data Source Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import gzip
+from contextlib import contextmanager
+from io import BytesIO
+from http.client import HTTPMessage
+import pytest
+from meteostat.core.loader import load_handler
+from meteostat.core.sources import FileResponse, open_url, register_opener
+
+CSV = b"year,month,temp\n2020,1,1.5\n2020,2,3.0\n"
+
+
+@pytest.fixture(name="mirror")
+def fixture_mirror(tmp_path):
+    """
+    Create a local mirror directory
+    """
+
+    (tmp_path / "monthly").mkdir()
+    (tmp_path / "monthly" / "10637.csv.gz").write_bytes(gzip.compress(CSV))
+
+    return tmp_path
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_load_handler_local_directory(mirror, memory_map):
+    """
+    Test loading files from a local directory
+    """
+
+    df = load_handler(f"{mirror}/", "monthly/10637.csv.gz", memory_map=memory_map)
+
+    assert df["temp"].tolist() == [1.5, 3.0]
+
+
+def test_load_handler_file_url(mirror):
+    """
+    Test loading files from a file:// URL and revalidating them
+    """
+
+    meta = {}
+    df = load_handler(mirror.as_uri() + "/", "monthly/10637.csv.gz", meta=meta)
+
+    assert len(df.index) == 2
+    assert meta["last_modified"]
+    assert (
+        load_handler(mirror.as_uri() + "/", "monthly/10637.csv.gz", meta=meta) is None
+    )
+
+
+def test_load_handler_local_missing(mirror):
+    """
+    Test missing local files
+    """
+
+    meta = {}
+    df = load_handler(f"{mirror}/", "monthly/10638.csv.gz", names=["a"], meta=meta)
+
+    assert df.empty
+    assert meta["status"] == 404
+
+
+def test_register_opener():
+    """
+    Test custom data sources
+    """
+
+    @contextmanager
+    def opener(_url, _headers):
+        yield FileResponse(BytesIO(gzip.compress(CSV)), 200, HTTPMessage())
+
+    register_opener("memory", opener)
+
+    with open_url("memory://monthly/10637.csv.gz") as response:
+        assert gzip.decompress(response.read()) == CSV
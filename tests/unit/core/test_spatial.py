@@ -0,0 +1,77 @@
+"""
+Spatial Index Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import numpy as np
+import pytest
+from meteostat.core.spatial import SpatialIndex
+from meteostat.utilities.helpers import get_distance
+
+# Random coordinates, including a point without coordinates
+rng = np.random.default_rng(0)
+LAT = np.append(np.rad2deg(np.arcsin(rng.uniform(-1, 1, 5000))), np.nan)
+LON = np.append(rng.uniform(-180, 180, 5000), 0)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, radius",
+    [(50.1, 8.7, 300000), (89.9, 0, 500000), (-10, 179.9, 400000), (0, 0, 3e7)],
+)
+def test_query_radius(lat, lon, radius):
+    """
+    Test: radius queries match a full scan
+    """
+
+    distances = get_distance(lat, lon, LAT, LON)
+    expected = np.flatnonzero(distances <= radius)
+
+    positions, result = SpatialIndex(LAT, LON).query_radius(lat, lon, radius)
+
+    assert sorted(positions) == sorted(expected)
+    assert np.allclose(result, distances[positions])
+    assert np.all(np.diff(result) >= 0)
+
+
+def test_query_nearest():
+    """
+    Test: nearest neighbour queries match a full scan
+    """
+
+    index = SpatialIndex(LAT, LON)
+    distances = get_distance(-45, 60, LAT, LON)
+
+    positions, _ = index.query_nearest(-45, 60, 10)
+    assert list(positions) == list(np.argsort(distances)[:10])
+
+    positions, _ = index.query_nearest(-45, 60, 10, radius=1)
+    assert len(positions) == 0
+
+    positions, _ = index.query_nearest(-45, 60, 10000)
+    assert len(positions) == len(index) == 5000
+
+
+def test_query_nearest_batch():
+    """
+    Test: batch queries match single nearest neighbour queries
+    """
+
+    index = SpatialIndex(LAT, LON)
+    lat, lon = rng.uniform(-90, 90, 50), rng.uniform(-180, 180, 50)
+
+    positions, distances = index.query_nearest_batch(
+        np.append(lat, np.nan), np.append(lon, 0), 3, radius=300000
+    )
+
+    assert (positions[50] == -1).all()
+
+    for i in range(50):
+        expected, dist = index.query_nearest(lat[i], lon[i], 3, radius=300000)
+        assert list(positions[i][positions[i] >= 0]) == list(expected)
+        assert np.allclose(distances[i][: len(dist)], dist)
+        assert np.isnan(distances[i][len(dist) :]).all()
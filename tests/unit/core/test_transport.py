@@ -0,0 +1,178 @@
+"""
+Transport Tests
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+import pytest
+from meteostat.core.transport import AsyncSession, urlopen
+
+# Client ports of all accepted connections
+CONNECTIONS = set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Serve a static body over persistent connections
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Handle GET request
+        """
+
+        CONNECTIONS.add(self.client_address)
+
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/data")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b"hello"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """
+    Run a local HTTP server
+    """
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    CONNECTIONS.clear()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_urlopen_reuses_connection(server):
+    """
+    Test connection reuse across requests
+    """
+
+    for _ in range(5):
+        with urlopen(f"{server}/data", timeout=5) as response:
+            assert response.read() == b"hello"
+
+    assert len(CONNECTIONS) == 1
+
+
+def test_urlopen_follows_redirect(server):
+    """
+    Test redirects
+    """
+
+    with urlopen(f"{server}/redirect", timeout=5) as response:
+        assert response.read() == b"hello"
+
+
+def test_urlopen_raises_http_error(server):
+    """
+    Test HTTP errors
+    """
+
+    with pytest.raises(HTTPError):
+        with urlopen(f"{server}/missing", timeout=5):
+            pass
+
+
+def test_urlopen_falls_back_to_urllib(tmp_path):
+    """
+    Test: URLs with other schemes are opened by urllib
+    """
+
+    path = tmp_path / "hello.txt"
+    path.write_bytes(b"hello")
+
+    with urlopen(path.as_uri()) as response:
+        assert response.read() == b"hello"
+
+    with pytest.raises(URLError):
+        with urlopen((tmp_path / "missing.txt").as_uri()):
+            pass
+
+
+def test_urlopen_environment_proxy(server, monkeypatch):
+    """
+    Test: proxies are taken from the environment unless bypassed
+    """
+
+    for name in ("http_proxy", "https_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+
+    # The local server acts as proxy of an unresolvable host
+    monkeypatch.setenv("http_proxy", server)
+
+    with urlopen("http://meteostat.invalid/data", timeout=5) as response:
+        assert response.read() == b"hello"
+
+    async def run():
+        async with AsyncSession(timeout=5) as session:
+            return await session.get("http://meteostat.invalid/data")
+
+    assert asyncio.run(run())[2] == b"hello"
+
+    # Hosts listed in NO_PROXY are requested directly
+    monkeypatch.setenv("http_proxy", "http://127.0.0.1:9")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+
+    with urlopen(f"{server}/data", timeout=5) as response:
+        assert response.read() == b"hello"
+
+
+def test_async_session_reuses_connection(server):
+    """
+    Test connection reuse of the asynchronous session
+    """
+
+    async def run():
+        async with AsyncSession(timeout=5) as session:
+            for _ in range(5):
+                status, _, body = await session.get(f"{server}/data")
+                assert status == 200
+                assert body == b"hello"
+
+    asyncio.run(run())
+
+    assert len(CONNECTIONS) == 1
+
+
+def test_async_session_raises_http_error(server):
+    """
+    Test HTTP errors of the asynchronous session
+    """
+
+    async def run():
+        async with AsyncSession(timeout=5) as session:
+            await session.get(f"{server}/redirect")
+            await session.get(f"{server}/missing")
+
+    with pytest.raises(HTTPError):
+        asyncio.run(run())
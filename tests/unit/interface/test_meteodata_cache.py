@@ -0,0 +1,336 @@
+"""
+Unit Test - MeteoData caching
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import asyncio
+import gzip
+import os
+import socket
+import threading
+import time
+import warnings
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+import pytest
+from meteostat import Daily, Point, Stations
+from meteostat.core import manifest
+from meteostat.core.cache import get_local_file_path
+from meteostat.core.memory import memory_cache
+
+COLUMNS = ["temp", "tmin", "tmax", "prcp", "snwd", "wdir", "wspd", "wpgt", "pres"]
+
+
+def daily_file(year: int) -> bytes:
+    """
+    Create a gzipped daily data dump
+    """
+
+    header = ",".join(
+        ["year", "month", "day"] + COLUMNS + ["tsun"] + [f"{c}_source" for c in COLUMNS]
+    )
+    rows = [
+        f"{year},1,{day},{day / 2},-1,3,0.5,,,5,,1010,," + ",".join(["synop"] * 9)
+        for day in range(1, 32)
+    ]
+
+    return gzip.compress("\n".join([header] + rows).encode() + b"\n")
+
+
+def stations_file(daily_start: str, daily_end: str) -> bytes:
+    """
+    Create a gzipped list of weather stations
+    """
+
+    return gzip.compress(
+        (
+            "10637,Frankfurt,DE,HE,10637,EDDF,50.05,8.6,111,Europe/Berlin,"
+            f"1926-01-01,2022-04-25,{daily_start},{daily_end},1926-01-01,2022-01-01\n"
+        ).encode()
+    )
+
+
+@pytest.fixture(name="daily")
+def fixture_daily(bulk_server, tmp_path, monkeypatch):
+    """
+    Point the Daily and Stations classes to a local server and cache
+    """
+
+    bulk_server.files["daily/2020/10637.csv.gz"] = daily_file(2020)
+    bulk_server.files["stations/slim.csv.gz"] = stations_file(
+        "1957-07-01", "2022-04-24"
+    )
+
+    for cls in (Daily, Stations):
+        monkeypatch.setattr(cls, "endpoint", bulk_server.url)
+        monkeypatch.setattr(cls, "cache_dir", str(tmp_path))
+
+    return Daily
+
+
+def test_revalidate_expired_file(daily, bulk_server):
+    """
+    Test: expired cache entries are revalidated instead of downloaded
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    expected = daily("10637", start, end).fetch()
+
+    # Let the cache entry expire
+    path = get_local_file_path(daily.cache_dir, "daily", "daily/2020/10637.csv.gz")
+    expired = time.time() - 2 * daily.max_age
+    os.utime(path, (expired, expired))
+
+    assert daily("10637", start, end).fetch().equals(expected)
+    assert bulk_server.requests[-1] == ("daily/2020/10637.csv.gz", 304)
+    assert time.time() - os.path.getmtime(path) < daily.max_age
+
+
+def test_missing_files_are_cached(daily, bulk_server):
+    """
+    Test: missing files are requested and reported only once
+    """
+
+    start, end = datetime(2017, 1, 1), datetime(2020, 1, 31)
+
+    with pytest.warns(Warning, match="Cannot load 3 of 4 files") as record:
+        daily("10637", start, end)
+
+    assert len(record) == 1
+    assert len(bulk_server.requests) == 4
+
+    # Files known to be missing are not reported again
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert daily("10637", start, end).count() == 31
+
+    assert len(bulk_server.requests) == 4
+
+
+def test_inventory_limits_datasets(daily, bulk_server, monkeypatch):
+    """
+    Test: years outside of a station's inventory are not requested
+    """
+
+    bulk_server.files["stations/slim.csv.gz"] = stations_file(
+        "2020-01-01", "2020-01-31"
+    )
+    monkeypatch.setattr(daily, "inventory_download", True)
+
+    data = daily("10637", datetime(1900, 1, 1), datetime(2023, 12, 31), model=False)
+
+    assert data.count() == 31
+    assert [path for path, _ in bulk_server.requests if path.startswith("daily")] == [
+        "daily/2020/10637.csv.gz"
+    ]
+
+
+def test_inventory_without_overlap(daily, bulk_server):
+    """
+    Test: periods outside of a station's inventory return an empty DataFrame
+    """
+
+    bulk_server.files["stations/slim.csv.gz"] = stations_file(
+        "2020-01-01", "2020-01-31"
+    )
+
+    # Load the list of weather stations
+    Stations()
+
+    for start, end in ((2000, 2005), (1900, 1920)):
+        data = daily("10637", datetime(start, 1, 1), datetime(end, 12, 31), model=False)
+        assert data.count() == 0
+        assert data.fetch().empty
+
+    assert not [path for path, _ in bulk_server.requests if path.startswith("daily")]
+
+
+def test_inventory_download(daily, bulk_server, monkeypatch):
+    """
+    Test: the list of weather stations is only downloaded for the inventory
+    if requested, and failed downloads are not repeated
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+
+    # A server which accepts connections, but never answers
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        monkeypatch.setattr(
+            Stations, "endpoint", f"http://127.0.0.1:{sock.getsockname()[1]}/"
+        )
+        monkeypatch.setattr(Stations, "timeout", 1)
+
+        started = time.time()
+        assert daily("10637", start, end).count() == 31
+        assert time.time() - started < 1
+
+        # Only the first request waits for the timeout
+        monkeypatch.setattr(daily, "inventory_download", True)
+        started = time.time()
+        for _ in range(2):
+            assert daily("10637", start, end).count() == 31
+
+        assert 1 <= time.time() - started < 2
+
+    assert not [path for path, _ in bulk_server.requests if path.startswith("stations")]
+
+
+def test_memory_cache(daily, bulk_server, monkeypatch):
+    """
+    Test: hot files are served from memory
+    """
+
+    monkeypatch.setattr(daily, "memory_cache_size", 10**7)
+    memory_cache.clear()
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    expected = daily("10637", start, end).fetch()
+
+    # Remove the file from the disk cache
+    path = get_local_file_path(daily.cache_dir, "daily", "daily/2020/10637.csv.gz")
+    os.remove(path)
+    requests = len(bulk_server.requests)
+    monkeypatch.setattr(manifest, "_flushed", time.time())
+
+    assert daily("10637", start, end).fetch().equals(expected)
+    assert len(bulk_server.requests) == requests
+    assert memory_cache.stats()["hits"] == 1
+
+    # Memory hits count as accesses of the disk cache entry
+    assert ("daily", os.path.basename(path)) in manifest._accessed[daily.cache_dir]
+
+
+def test_single_flight_download(daily, bulk_server):
+    """
+    Test: concurrent loads of the same file download it only once
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+
+    with ThreadPool(4) as pool:
+        results = pool.map(lambda _: daily("10637", start, end).count(), range(4))
+
+    assert results == [31] * 4
+    assert bulk_server.requests.count(("daily/2020/10637.csv.gz", 200)) == 1
+    assert not [
+        file
+        for file in os.listdir(
+            os.path.dirname(get_local_file_path(daily.cache_dir, "daily", "x"))
+        )
+        if file.endswith(".tmp")
+    ]
+
+
+def test_shared_cache(daily, bulk_server, tmp_path, monkeypatch):
+    """
+    Test: files are promoted from the shared cache instead of downloaded
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    expected = daily("10637", start, end).fetch()
+    requests = len(bulk_server.requests)
+
+    # Use the populated cache as the shared cache of a new local cache
+    for cls in (Daily, Stations):
+        monkeypatch.setattr(cls, "shared_cache_dir", cls.cache_dir)
+        monkeypatch.setattr(cls, "cache_dir", str(tmp_path / "local"))
+
+    assert daily("10637", start, end).fetch().equals(expected)
+    assert len(bulk_server.requests) == requests
+    assert os.path.isfile(
+        get_local_file_path(daily.cache_dir, "daily", "daily/2020/10637.csv.gz")
+    )
+
+
+def test_stale_while_revalidate(daily, bulk_server, monkeypatch):
+    """
+    Test: stale entries are served while they are refreshed in the background
+    """
+
+    monkeypatch.setattr(daily, "stale_while_revalidate", daily.max_age)
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    expected = daily("10637", start, end).fetch()
+
+    # Let the cache entry expire
+    path = get_local_file_path(daily.cache_dir, "daily", "daily/2020/10637.csv.gz")
+    expired = time.time() - 1.5 * daily.max_age
+    os.utime(path, (expired, expired))
+
+    assert daily("10637", start, end).fetch().equals(expected)
+
+    # Wait for the background refresh
+    for _ in range(100):
+        if time.time() - os.path.getmtime(path) < daily.max_age:
+            break
+        time.sleep(0.05)
+
+    assert bulk_server.requests[-1] == ("daily/2020/10637.csv.gz", 304)
+    assert time.time() - os.path.getmtime(path) < daily.max_age
+
+
+def test_historical_max_age(daily, bulk_server, monkeypatch):
+    """
+    Test: files of completed years are kept for the historical max age
+    """
+
+    monkeypatch.setattr(daily, "historical_max_age", float("inf"))
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    expected = daily("10637", start, end).fetch()
+
+    # Expire the file by the regular max age
+    path = get_local_file_path(daily.cache_dir, "daily", "daily/2020/10637.csv.gz")
+    expired = time.time() - 2 * daily.max_age
+    os.utime(path, (expired, expired))
+    requests = len(bulk_server.requests)
+
+    assert daily("10637", start, end).fetch().equals(expected)
+    assert len(bulk_server.requests) == requests
+
+    # The current year is refreshed as usual
+    data = daily("10637", start, end)
+    assert data._get_max_age(datetime.now().year) == daily.max_age
+    assert data._get_max_age(2020) == float("inf")
+
+
+def test_load_async(daily, bulk_server, tmp_path, monkeypatch):
+    """
+    Test: asynchronous loading matches the synchronous result without
+    blocking the event loop
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 31)
+    location = Point(50.05, 8.6, 111)
+    expected = daily(location, start, end).fetch()
+
+    # Start with an empty cache
+    for cls in (Daily, Stations):
+        monkeypatch.setattr(cls, "cache_dir", str(tmp_path / "async"))
+
+    # Remember the threads which parse and process files
+    threads = set()
+    process_file = daily._process_file
+
+    def record(self, *args, **kwargs):
+        threads.add(threading.get_ident())
+        return process_file(self, *args, **kwargs)
+
+    monkeypatch.setattr(daily, "_process_file", record)
+
+    async def run():
+        data = await daily.load_async(location, start, end)
+        return data, threading.get_ident()
+
+    data, loop_thread = asyncio.run(run())
+
+    assert data.fetch().equals(expected)
+    assert threads and loop_thread not in threads
+    assert bulk_server.requests.count(("daily/2020/10637.csv.gz", 200)) == 2
@@ -0,0 +1,83 @@
+"""
+Unit Test - Prefetching
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+from datetime import datetime
+import pytest
+from meteostat import Daily, Stations, prefetch
+from meteostat.__main__ import main
+from .test_meteodata_cache import daily_file, stations_file
+
+
+@pytest.fixture(name="server")
+def fixture_server(bulk_server, tmp_path, monkeypatch):
+    """
+    Point the Daily and Stations classes to a local server and cache
+    """
+
+    bulk_server.files["daily/2020/10637.csv.gz"] = daily_file(2020)
+    bulk_server.files["stations/slim.csv.gz"] = stations_file(
+        "1957-07-01", "2022-04-24"
+    )
+
+    for cls in (Daily, Stations):
+        monkeypatch.setattr(cls, "endpoint", bulk_server.url)
+        monkeypatch.setattr(cls, "cache_dir", str(tmp_path))
+
+    return bulk_server
+
+
+def test_prefetch_is_resumable(server):
+    """
+    Test: prefetched files are not downloaded again
+    """
+
+    start, end = datetime(2020, 1, 1), datetime(2021, 12, 31)
+    progress = []
+
+    report = prefetch(
+        ["10637"], ["daily"], start, end, progress=lambda *args: progress.append(args)
+    )
+
+    assert report["files"] == 2
+    assert report["downloaded"] == 1
+    assert report["missing"] == 1
+    assert report["bytes"] > 0
+    assert progress[-1] == (2, 2)
+
+    requests = len(server.requests)
+
+    assert prefetch(["10637"], ["daily"], start, end)["skipped"] == 2
+    assert Daily("10637", start, end).count() == 31
+    assert len(server.requests) == requests
+
+
+def test_prefetch_command(server, capsys):
+    """
+    Test: prefetching from the command line
+    """
+
+    status = main(
+        [
+            "prefetch",
+            "--stations",
+            "10637",
+            "--granularity",
+            "daily",
+            "--start",
+            "2020-01-01",
+            "--end",
+            "2020-12-31",
+            "--quiet",
+        ]
+    )
+
+    assert status == 0
+    assert capsys.readouterr().out.startswith("1 files")
+    assert ("daily/2020/10637.csv.gz", 200) in server.requests
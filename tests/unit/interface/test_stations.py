@@ -0,0 +1,272 @@
+"""
+Unit Test - Stations
+
+Meteorological data provided by Meteostat (https://dev.meteostat.net)
+under the terms of the Creative Commons Attribution-NonCommercial
+4.0 International Public License.
+
+The code is licensed under the MIT license.
+"""
+
+import gzip
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from meteostat import Stations
+from meteostat.core.cache import get_local_file_path
+from meteostat.utilities.helpers import get_distance
+
+
+def stations_file(count: int) -> bytes:
+    """
+    Create a gzipped list of weather stations with random coordinates
+    """
+
+    rng = np.random.default_rng(0)
+    rows = [
+        f"{i:05d},Station {i},{'DE' if i % 2 else 'US'},{'HE' if i % 3 else 'NY'},"
+        f"{i:05d},E{i:03d},{lat:.4f},{lon:.4f},{i % 500},Europe/Berlin,"
+        f"1990-01-01,2020-12-31,{1950 + i % 60}-01-01,{1990 + i % 35}-12-31,"
+        "1990-01-01,2020-01-01"
+        for i, (lat, lon) in enumerate(
+            zip(rng.uniform(45, 55, count), rng.uniform(0, 15, count))
+        )
+    ]
+
+    return gzip.compress("\n".join(rows).encode() + b"\n")
+
+
+@pytest.fixture(name="stations")
+def fixture_stations(bulk_server, tmp_path, monkeypatch):
+    """
+    Point the Stations class to a local server and cache
+    """
+
+    bulk_server.files["stations/slim.csv.gz"] = stations_file(2000)
+
+    monkeypatch.setattr(Stations, "endpoint", bulk_server.url)
+    monkeypatch.setattr(Stations, "cache_dir", str(tmp_path))
+
+    return Stations
+
+
+def test_nearby(stations):
+    """
+    Test: nearby stations match a full scan without changing the list
+    """
+
+    full = stations()
+    data = full.fetch()
+    distances = get_distance(50, 8, data["latitude"], data["longitude"])
+
+    result = full.nearby(50, 8, 50000).fetch()
+
+    assert list(result.index) == list(distances[distances <= 50000].sort_values().index)
+    assert np.allclose(result["distance"], distances[result.index])
+    assert "distance" not in full.fetch().columns
+    assert full.nearby(50, 8).count() == 2000
+
+
+def test_nearest(stations):
+    """
+    Test: batch lookups return the same stations as nearby
+    """
+
+    full = stations()
+    positions, distances = full.nearest([50, 46], [8, 1], k=2)
+
+    for (lat, lon), row, dist in zip([(50, 8), (46, 1)], positions, distances):
+        expected = full.nearby(lat, lon).fetch(2)
+        assert list(full.fetch().index[row]) == list(expected.index)
+        assert np.allclose(dist, expected["distance"])
+
+
+def test_shared_table(stations, bulk_server, monkeypatch):
+    """
+    Test: the list of weather stations is loaded once and never modified
+    """
+
+    first, second = stations(), stations()
+
+    assert first.fetch().equals(second.fetch())
+    assert first._table is second._table
+    assert len(bulk_server.requests) == 1
+
+    # Converted views don't change the shared list
+    converted = first.convert({"elevation": lambda value: value * 2})
+    assert converted.fetch()["elevation"].equals(first.fetch()["elevation"] * 2)
+    assert stations().fetch().equals(second.fetch())
+
+    # The list is loaded again once it expires
+    monkeypatch.setattr(stations, "max_age", 0)
+    assert stations()._table is not first._table
+
+
+def test_query_plan(stations):
+    """
+    Test: chained filters match filtering the full list step by step
+    """
+
+    full = stations()
+    data = full.fetch()
+    period = (datetime(2000, 1, 1), datetime(2010, 12, 31))
+
+    expected = data[
+        (data["country"] == "DE")
+        & (data["region"] == "HE")
+        & (data["daily_start"] <= period[0])
+        & (data["daily_end"] >= period[1])
+    ]
+    expected = expected.assign(
+        distance=get_distance(50, 8, expected["latitude"], expected["longitude"])
+    )
+    expected = expected[expected["distance"] <= 100000].sort_values("distance")
+
+    query = full.region("DE", "HE").inventory("daily", period).nearby(50, 8, 100000)
+
+    assert query.count() == len(expected.index)
+    assert query.fetch().equals(expected)
+    assert query.fetch(3).equals(expected.head(3))
+    assert (
+        full.region("DE")
+        .nearby(50, 8)
+        .fetch(3)
+        .equals(full.nearby(50, 8).region("DE").fetch().head(3))
+    )
+    assert full.fetch().equals(data)
+
+
+def test_codes(stations):
+    """
+    Test: stations are found by their WMO and ICAO codes
+    """
+
+    full = stations()
+
+    assert list(full.wmo("00042").fetch().index) == ["00042"]
+    assert list(full.icao(["E042", "E007", "XXXX"]).fetch().index) == [
+        "00007",
+        "00042",
+    ]
+    assert full.region("XX").count() == 0
+    assert full.region("DE", "HE").count() == len(
+        full.fetch().query("country == 'DE' and region == 'HE'").index
+    )
+
+    ids = full.lookup("icao", ["E042", "XXXX", "E007"])
+    assert list(ids.index) == ["E042", "XXXX", "E007"]
+    assert ids.iloc[0] == "00042" and pd.isna(ids.iloc[1]) and ids.iloc[2] == "00007"
+
+    # Codes outside of the selection aren't found
+    assert full.region("DE").lookup("wmo", ["00042", "00007"]).isna().tolist() == [
+        True,
+        False,
+    ]
+
+
+def test_inventory(stations):
+    """
+    Test: inventory filters and counts match a full scan
+    """
+
+    full = stations()
+    data = full.fetch()
+    periods = [datetime(1995, 6, 1), (datetime(1980, 1, 1), datetime(2000, 1, 1))]
+
+    end = data["daily_end"] + timedelta(seconds=full.max_age)
+
+    expected = []
+    for first, last in [(periods[0], periods[0]), periods[1]]:
+        active = data[(data["daily_start"] <= first) & (end >= last)]
+        expected.append(active)
+        assert full.inventory("daily", (first, last)).fetch().equals(active)
+
+    assert list(full.inventory_counts("daily", periods)) == [
+        len(active.index) for active in expected
+    ]
+    assert list(full.region("DE").inventory_counts("daily", periods)) == [
+        (active["country"] == "DE").sum() for active in expected
+    ]
+
+
+def test_compact(stations, monkeypatch):
+    """
+    Test: the compact list returns the same stations with less memory
+    """
+
+    full = stations()
+    monkeypatch.setattr(stations, "compact", True)
+    compact = stations()
+    period = (datetime(1980, 1, 1), datetime(2000, 1, 1))
+
+    assert compact._table is not full._table
+    assert compact._table.memory_usage(deep=True).sum() < (
+        full._table.memory_usage(deep=True).sum()
+    )
+    assert compact.fetch().equals(full.fetch())
+
+    for query in (
+        lambda selection: selection.nearby(50, 8, 100000),
+        lambda selection: selection.region("DE", "HE").bounds((52, 2), (48, 10)),
+        lambda selection: selection.inventory("daily", period).icao("E042"),
+    ):
+        assert query(compact).fetch().equals(query(full).fetch())
+
+
+def test_table_expiry(stations, bulk_server, monkeypatch):
+    """
+    Test: the list of weather stations expires with its cache entry
+    """
+
+    stations()
+    path = get_local_file_path(stations.cache_dir, "stations", "stations/slim.csv.gz")
+    aged = time.time() - stations.max_age / 2
+    os.utime(path, (aged, aged))
+
+    # Read the aged cache entry
+    monkeypatch.setattr(stations, "compact", True)
+    table = stations()._table
+    assert len(bulk_server.requests) == 1
+
+    # The cache entry expires before the list was loaded for max_age seconds
+    now = time.time
+    monkeypatch.setattr(time, "time", lambda: now() + stations.max_age * 0.6)
+    assert stations()._table is not table
+    assert bulk_server.requests[-1] == ("stations/slim.csv.gz", 304)
+
+
+def test_concurrent_tables(stations, monkeypatch):
+    """
+    Test: loading one list of weather stations doesn't block other lists
+    """
+
+    loading, release = threading.Event(), threading.Event()
+    read = stations._read
+
+    def slow_read(self):
+        if not self.compact:
+            loading.set()
+            release.wait(10)
+        return read(self)
+
+    monkeypatch.setattr(stations, "_read", slow_read)
+    compact = type("CompactStations", (stations,), {"compact": True})
+
+    first = threading.Thread(target=stations)
+    second = threading.Thread(target=compact)
+
+    try:
+        first.start()
+        loading.wait(5)
+        second.start()
+        second.join(5)
+        assert not second.is_alive()
+        assert not release.is_set()
+    finally:
+        release.set()
+        first.join()
+        second.join()